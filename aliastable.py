@@ -0,0 +1,56 @@
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class AliasTable:
+    def __init__(self, probabilities: array, aliases: array):
+        self.probabilities = probabilities
+        self.aliases = aliases
+
+    @classmethod
+    def build(cls, weights):
+        size = len(weights)
+        total = float(sum(weights))
+        if size == 0 or total <= 0:
+            raise ValueError("Alias table needs at least one positive weight")
+        scaled = [weight * size / total for weight in weights]
+        probabilities = array("d", bytes(8 * size))
+        aliases = array("I", range(size))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] += scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        for index in small + large:
+            probabilities[index] = 1.0
+        return cls(probabilities, aliases)
+
+    def __len__(self):
+        return len(self.probabilities)
+
+    def draw(self, random_generator: random.Random):
+        index = int(random_generator.random() * len(self.probabilities))
+        if random_generator.random() < self.probabilities[index]:
+            return index
+        return self.aliases[index]
+
+    def draw_many(self, count, random_generator: random.Random, numpy_generator=None):
+        if numpy_generator is not None and np is not None:
+            probabilities = np.frombuffer(self.probabilities, dtype=np.float64)
+            aliases = np.frombuffer(self.aliases, dtype=np.uint32)
+            indices = numpy_generator.integers(0, len(probabilities), count)
+            keep = numpy_generator.random(count) < probabilities[indices]
+            return np.where(keep, indices, aliases[indices]).tolist()
+        return [self.draw(random_generator) for _ in range(count)]
@@ -0,0 +1,128 @@
+from functools import lru_cache
+
+PENDING = 0
+CORRECT = 1
+WRONG = 2
+MATCH_MASK_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=MATCH_MASK_CACHE_SIZE)
+def get_match_masks(word: str):
+    masks = {}
+    for i, letter in enumerate(word):
+        masks[letter] = masks.get(letter, 0) | (1 << i)
+    return masks
+
+
+def get_first_column(word: str):
+    return (1 << len(word)) - 1, 0
+
+
+def get_next_column(word: str, column, letter):
+    full_mask = (1 << len(word)) - 1
+    vertical_positive, vertical_negative = column
+    matches = get_match_masks(word).get(letter, 0)
+    vertical_change = matches | vertical_negative
+    horizontal_change = (((matches & vertical_positive) + vertical_positive) ^ vertical_positive) | matches
+    horizontal_positive = vertical_negative | ~(horizontal_change | vertical_positive)
+    horizontal_negative = vertical_positive & horizontal_change
+    horizontal_positive = ((horizontal_positive << 1) | 1) & full_mask
+    horizontal_negative = (horizontal_negative << 1) & full_mask
+    vertical_positive = (horizontal_negative | ~(vertical_change | horizontal_positive)) & full_mask
+    vertical_negative = horizontal_positive & vertical_change
+    return vertical_positive, vertical_negative
+
+
+def extend_columns(word: str, typed: str, columns: list):
+    if not columns:
+        columns.append(get_first_column(word))
+    for j in range(len(columns) - 1, len(typed)):
+        columns.append(get_next_column(word, columns[j], typed[j]))
+    return columns
+
+
+def get_distance(column, row, column_index):
+    vertical_positive, vertical_negative = column
+    mask = (1 << row) - 1
+    return column_index + (vertical_positive & mask).bit_count() - (vertical_negative & mask).bit_count()
+
+
+def get_prefix_end(word: str, column, column_index):
+    vertical_positive, vertical_negative = column
+    distance = best_distance = column_index
+    best_row = 0
+    for row in range(1, len(word) + 1):
+        bit = 1 << (row - 1)
+        distance += bool(vertical_positive & bit) - bool(vertical_negative & bit)
+        if distance <= best_distance:
+            best_distance = distance
+            best_row = row
+    return best_row
+
+
+def trace_letter_states(word: str, typed: str, columns: list, end, letter_states: bytearray):
+    letter_states[:] = bytes(len(word))
+    row, column_index = end, len(typed)
+    distance = get_distance(columns[column_index], row, column_index)
+    insertions = []
+    while row > 0 or column_index > 0:
+        if row > 0 and column_index > 0:
+            cost = word[row - 1] != typed[column_index - 1]
+            if get_distance(columns[column_index - 1], row - 1, column_index - 1) + cost == distance:
+                letter_states[row - 1] = WRONG if cost else CORRECT
+                distance -= cost
+                row -= 1
+                column_index -= 1
+                continue
+        if row > 0 and get_distance(columns[column_index], row - 1, column_index) + 1 == distance:
+            letter_states[row - 1] = WRONG
+            row -= 1
+        else:
+            insertions.append(row)
+            column_index -= 1
+        distance -= 1
+    if word:
+        for row in insertions:
+            letter_states[min(row, len(word) - 1)] = WRONG
+    return letter_states
+
+
+def align(word: str, typed: str, final=True, columns: list | None = None, letter_states: bytearray | None = None):
+    columns = extend_columns(word, typed, [] if columns is None else columns)
+    end = len(word) if final else get_prefix_end(word, columns[len(typed)], len(typed))
+    if letter_states is None:
+        letter_states = bytearray(len(word))
+    return trace_letter_states(word, typed, columns, end, letter_states)
+
+
+def get_last_aligned_index(word: str, typed: str, columns: list | None = None):
+    columns = extend_columns(word, typed, [] if columns is None else columns)
+    column_index = len(typed)
+    if not column_index:
+        return None
+    row = get_prefix_end(word, columns[column_index], column_index)
+    distance = get_distance(columns[column_index], row, column_index)
+    while row > 0:
+        cost = word[row - 1] != typed[column_index - 1]
+        if get_distance(columns[column_index - 1], row - 1, column_index - 1) + cost == distance:
+            return row - 1
+        if get_distance(columns[column_index], row - 1, column_index) + 1 != distance:
+            return None
+        row -= 1
+        distance -= 1
+    return None
+
+
+def get_edit_distance(word: str, typed: str):
+    columns = extend_columns(word, typed, [])
+    return get_distance(columns[-1], len(word), len(typed))
+
+
+def get_correct_letter_count(word: str, typed: str):
+    if word == typed:
+        return len(word)
+    return align(word, typed).count(CORRECT)
+
+
+def score_words(pairs):
+    return sum(get_correct_letter_count(word, typed) for word, typed in pairs)
@@ -0,0 +1,154 @@
+import mmap
+import numpy as np
+from alignment import get_last_aligned_index
+from recorder import TEXT_UPDATED, WORD_SUBMITTED, FIELD_CLEARED, read_events, replay_events
+from stats import Statistics
+
+NO_CHARACTER = 0
+WORD_BREAK = ord(" ")
+MAX_BIGRAM_GAP = 2.0
+MAX_DENSE_BIGRAMS = 1 << 22
+ROLLING_WINDOW = 10.0
+ROLLING_STEP = 1.0
+CHARS_PER_WORD = 5
+
+
+class KeystrokeLog:
+    def __init__(self, timestamps, expected, typed):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.expected = np.asarray(expected, dtype=np.uint32)
+        self.typed = np.asarray(typed, dtype=np.uint32)
+
+    @classmethod
+    def from_lists(cls, timestamps: list[float], expected: list[str], typed: list[str]):
+        return cls(timestamps, [ord(char) if char else NO_CHARACTER for char in expected],
+                   [ord(char) if char else NO_CHARACTER for char in typed])
+
+    @classmethod
+    def concatenate(cls, logs):
+        logs = list(logs)
+        if not logs:
+            return cls([], [], [])
+        return cls(np.concatenate([log.timestamps for log in logs]),
+                   np.concatenate([log.expected for log in logs]),
+                   np.concatenate([log.typed for log in logs]))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+class KeystrokeCollector:
+    def __init__(self):
+        self.timestamps = []
+        self.expected = []
+        self.typed = []
+        self.last_text = ""
+        self.columns = []
+
+    def __call__(self, session, timestamp, kind, value):
+        if kind == TEXT_UPDATED:
+            self.add_text(session.get_current_word().word, timestamp, value)
+        elif kind == WORD_SUBMITTED:
+            self.add_keystroke(timestamp, WORD_BREAK, WORD_BREAK)
+            self.clear_text()
+        elif kind == FIELD_CLEARED:
+            self.clear_text()
+
+    def add_text(self, word, timestamp, text):
+        index = len(self.last_text)
+        if len(text) == index + 1 and text.startswith(self.last_text):
+            word_index = get_last_aligned_index(word, text, self.columns)
+            expected = ord(word[word_index]) if word_index is not None else NO_CHARACTER
+            self.add_keystroke(timestamp, expected, ord(text[index]))
+        else:
+            self.columns = []
+        self.last_text = text
+
+    def clear_text(self):
+        self.last_text = ""
+        self.columns = []
+
+    def add_keystroke(self, timestamp, expected, typed):
+        self.timestamps.append(timestamp)
+        self.expected.append(expected)
+        self.typed.append(typed)
+
+    def get_log(self):
+        return KeystrokeLog(self.timestamps, self.expected, self.typed)
+
+
+def read_keystrokes(path):
+    collector = KeystrokeCollector()
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        replay_events(read_events(buffer), Statistics(), collector)
+    return collector.get_log()
+
+
+class KeystrokeAnalytics:
+    def __init__(self, log: KeystrokeLog):
+        self.log = log
+        self.errors = log.expected != log.typed
+        self.alphabet = np.union1d(log.expected, log.typed)
+        lookup = np.zeros(int(self.alphabet[-1]) + 1 if len(self.alphabet) else 1, dtype=np.int64)
+        lookup[self.alphabet] = np.arange(len(self.alphabet))
+        self.expected_indices = lookup[log.expected]
+        self.typed_indices = lookup[log.typed]
+
+    def get_label(self, index):
+        character = int(self.alphabet[index])
+        return "" if character == NO_CHARACTER else chr(character)
+
+    def get_error_rates(self):
+        expected = self.log.expected
+        counted = expected != NO_CHARACTER
+        totals = np.bincount(expected[counted])
+        errors = np.bincount(expected[counted], weights=self.errors[counted], minlength=len(totals))
+        characters = np.nonzero(totals)[0]
+        rates = errors[characters] / totals[characters]
+        return {chr(character): (float(rate), int(total))
+                for character, rate, total in zip(characters, rates, totals[characters])}
+
+    def get_bigram_latencies(self):
+        log = self.log
+        if len(log) < 2:
+            return {}
+        size = len(self.alphabet)
+        first = self.expected_indices[:-1]
+        second = self.expected_indices[1:]
+        gaps = np.diff(log.timestamps)
+        valid = ((log.expected[:-1] != NO_CHARACTER) & (log.expected[1:] != NO_CHARACTER)
+                 & ~self.errors[:-1] & ~self.errors[1:] & (gaps >= 0) & (gaps <= MAX_BIGRAM_GAP))
+        keys = first[valid] * size + second[valid]
+        if size * size <= MAX_DENSE_BIGRAMS:
+            counts = np.bincount(keys, minlength=size * size)
+            totals = np.bincount(keys, weights=gaps[valid], minlength=size * size)
+            bigrams = np.nonzero(counts)[0]
+            counts = counts[bigrams]
+            totals = totals[bigrams]
+        else:
+            bigrams, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            totals = np.bincount(inverse, weights=gaps[valid], minlength=len(bigrams))
+        means = totals / counts
+        return {self.get_label(key // size) + self.get_label(key % size): (float(mean), int(count))
+                for key, mean, count in zip(bigrams, means, counts)}
+
+    def get_confusion_matrix(self):
+        size = len(self.alphabet)
+        matrix = np.bincount(self.expected_indices * size + self.typed_indices,
+                             minlength=size * size).reshape(size, size)
+        return [self.get_label(index) for index in range(size)], matrix
+
+    def get_rolling_wpm(self, window=ROLLING_WINDOW, step=ROLLING_STEP):
+        log = self.log
+        if not len(log):
+            return np.empty(0), np.empty(0)
+        order = np.argsort(log.timestamps, kind="stable")
+        timestamps = log.timestamps[order]
+        correct = np.concatenate(([0], np.cumsum(~self.errors[order])))
+        sample_times = np.arange(timestamps[0] + window, timestamps[-1] + step, step)
+        if not len(sample_times):
+            sample_times = np.array([timestamps[-1]])
+        ends = np.searchsorted(timestamps, sample_times, side="right")
+        starts = np.searchsorted(timestamps, sample_times - window, side="right")
+        characters = correct[ends] - correct[starts]
+        return sample_times, characters / CHARS_PER_WORD * (60 / window)
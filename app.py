@@ -2,6 +2,16 @@ import tkinter
 from timer import Timer
 from frames import *
 from stats import Statistics
+from sessionstore import SessionStore
+from typingsession import TypingSession
+from wordgenerator import WordGenerator
+from recorder import RecordingSubscriber, RecordingWordSource
+from eventbus import EventBus, SessionStarted, TextUpdated, WordSubmitted, FieldCleared, SessionFinished
+from latency import latency_probe
+from history import HistoryStore, SessionResult
+from ranking import RankingIndex, RankingStore
+import os
+import time
 from settings import *
 
 
@@ -12,22 +22,27 @@ class App(tkinter.Tk):
         self.title("Typing Speed Check")
         self.configure(padx=50, pady=50)
         self.configure(background=BLUE)
-        self.word_generator = WordGenerator()
-        self.words_buffer = self.get_starting_words()
-        self.update_notifier = UpdateNotifier(word_submitted=self.next_word_request,
-                                              field_cleared=self.previous_word_request,
-                                              text_update=self.input_field_changed)
-        self.statistics = Statistics()
+        self.word_generator = WordGenerator(WORDS_FILE, seed=WORD_SEED, adaptive=ADAPTIVE_WORDS,
+                                            quote_mode=QUOTE_MODE)
+        self.pending_label_update = None
+        self.event_bus = self.create_event_bus()
+        self.session_store = SessionStore()
+        self.statistics = Statistics(self.session_store)
+        self.history = HistoryStore(HISTORY_FILE)
+        self.ranking = self.load_ranking()
 
         # layout
         self.create_title_label()
         self.stats_frame = StatisticsFrame(self, self.statistics)
-        self.text_input_frame = TextInputFrame(self, self.update_notifier)
-        self.text_matrix = TextMatrixFrame(self, self.words_buffer, self.statistics)
+        self.text_input_frame = TextInputFrame(self, self.event_bus, self.session_store)
+        self.text_matrix = self.create_text_matrix()
         self.button_frame = ButtonFrame(self, self.start, self.reset)
-        self.timer = Timer(self, label_update_func=self.stats_frame.update_timer_label, stop_func=self.stop)
+        self.chart_frame = ChartFrame(self, self.statistics) if SHOW_CHART else None
+        self.timer = Timer(self, label_update_func=self.stats_frame.update_timer_label, stop_func=self.stop,
+                           tick_func=self.tick)
         self.ready = True
         self.text_input_frame.text_box.focus()
+        self.protocol("WM_DELETE_WINDOW", self.close)
         self.mainloop()
 
     def create_title_label(self):
@@ -35,41 +50,106 @@ class App(tkinter.Tk):
                                background=BLUE, padx=10, font=(FONT_NAME, TITLE_SIZE, "bold"))
         title_label.grid(column=0, row=0, sticky="")
 
-    def get_starting_words(self):
-        return self.word_generator.get_word_matrix(ROWS_OF_WORDS, WORDS_IN_ROW)
+    def create_event_bus(self):
+        event_bus = EventBus(EVENT_QUEUE_SIZE, EVENT_BACKPRESSURE)
+        event_bus.subscribe(TextUpdated, self.input_field_changed)
+        event_bus.subscribe(WordSubmitted, self.next_word_request)
+        event_bus.subscribe(FieldCleared, self.previous_word_request)
+        if RECORD_SESSIONS:
+            RecordingSubscriber(RECORDINGS_FOLDER).subscribe(event_bus)
+        return event_bus
 
-    def next_word_request(self, current_input):
+    def create_session(self):
+        self.pending_label_update = None
+        word_source = self.word_generator
+        if RECORD_SESSIONS:
+            self.event_bus.publish(SessionStarted())
+            word_source = RecordingWordSource(self.word_generator, self.event_bus)
+        starting_words = word_source.get_word_matrix(ROWS_OF_WORDS, WORDS_IN_ROW)
+        return TypingSession(starting_words, self.statistics, word_source)
+
+    def create_text_matrix(self):
+        if MATRIX_RENDERER == "text":
+            return TaggedTextMatrixFrame(self, self.create_session())
+        return TextMatrixFrame(self, self.create_session())
+
+    def next_word_request(self, event: WordSubmitted):
         if not self.ready:
             return
-        self.text_matrix.move_to_next_word(current_input)
-        self.stats_frame.update_labels()
+        if not self.timer.timer_running:
+            self.start()
+        self.text_matrix.move_to_next_word(event.text)
+        self.schedule_label_update()
+
+    def schedule_label_update(self):
+        if self.pending_label_update is None:
+            self.pending_label_update = self.after_idle(self.update_labels)
 
-    def previous_word_request(self):
+    def update_labels(self):
+        self.pending_label_update = None
+        self.stats_frame.update_labels(self.timer.get_elapsed())
+
+    def tick(self, elapsed):
+        self.stats_frame.update_labels(elapsed)
+        if self.chart_frame is not None:
+            self.chart_frame.update_chart(elapsed, self.timer.start_time + elapsed)
+
+    def previous_word_request(self, event: FieldCleared):
         if not self.ready:
             return
         self.text_matrix.move_to_previous_word()
 
-    def input_field_changed(self, current_input):
+    def input_field_changed(self, event: TextUpdated):
         if not self.ready:
             return
+        latency_probe.mark("dispatch")
         if not self.timer.timer_running:
             self.start()
-        self.text_matrix.check_word(current_input)
+        self.text_matrix.check_word(event.text)
+        if latency_probe.enabled:
+            self.after_idle(latency_probe.mark, "paint")
 
     def start(self):
         self.timer.start_timer()
 
     def stop(self):
         self.ready = False
+        self.save_result()
+        self.event_bus.publish(SessionFinished(self.timer.get_elapsed()))
+        if latency_probe.enabled:
+            latency_probe.dump(LATENCY_FOLDER)
         self.button_frame.stop()
         self.button_frame.reset_button.focus()
 
+    def save_result(self):
+        duration = self.timer.get_elapsed()
+        self.history.add_session(SessionResult(time.time() - duration, duration, self.statistics))
+        scores = RankingIndex.get_scores(self.statistics, duration)
+        self.stats_frame.update_ranking_label(self.ranking.get_ranks(USER_NAME, scores))
+        self.ranking.add_scores(USER_NAME, scores)
+        self.ranking.save(RANKING_FILE)
+
+    def load_ranking(self):
+        if os.path.exists(RANKING_FILE):
+            return RankingStore.load(RANKING_FILE)
+        return RankingStore.from_history(USER_NAME, self.history.get_session_scores())
+
+    def close(self):
+        self.event_bus.publish(SessionFinished(self.timer.get_elapsed()))
+        self.event_bus.close()
+        self.history.close()
+        self.destroy()
+
     def reset(self):
+        self.timer.reset_timer()
         self.statistics.clear()
-        self.text_matrix.grid_forget()
-        self.text_matrix = TextMatrixFrame(self, self.get_starting_words(), self.statistics)
-        self.stats_frame.update_labels()
+        self.text_matrix.destroy()
+        self.text_matrix = self.create_text_matrix()
+        self.stats_frame.update_labels(self.timer.get_elapsed())
         self.stats_frame.update_timer_label(TIMER_LENGTH)
+        self.stats_frame.update_ranking_label(None)
+        if self.chart_frame is not None:
+            self.chart_frame.clear()
         self.text_input_frame.clear()
         self.text_input_frame.text_box.focus()
         self.ready = True
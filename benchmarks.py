@@ -0,0 +1,471 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from corpus import CACHE_SUFFIX, CorpusWriter, clear_corpus_cache
+from sessionstore import WordStat
+from settings import WORDS_IN_ROW
+from stats import Statistics
+from typingsession import TypingSession
+from wordgenerator import WordGenerator
+
+BASELINE_FILE = "benchmarks.json"
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2
+XVFB_DISPLAY = ":99"
+XVFB_TIMEOUT = 5.0
+RESCAN_WORD_COUNT = 5000
+BURST_KEY_COUNT = 1000
+BURST_LENGTH = 4
+HISTORY_SESSION_COUNT = 1000
+HISTORY_SESSION_WORDS = 40
+LARGE_CORPUS_SIZE = 1000000
+HUGE_CORPUS_SIZE = 5000000
+HUGE_CORPUS_DRAWS = 60000
+ADAPTIVE_DRAWS = 20000
+
+benchmarks = {}
+
+
+def benchmark(name, operations, gui=False, memory=False):
+    def register(function):
+        benchmarks[name] = (function, operations, gui, memory)
+        return function
+    return register
+
+
+@benchmark("wordgenerator_load", operations=1)
+def bench_wordgenerator_load(context):
+    clear_corpus_cache()
+    WordGenerator(seed=1)
+
+
+@benchmark("corpus_1m_cold_parse", operations=1)
+def bench_corpus_cold_parse(context):
+    path = get_generated_corpus(context, LARGE_CORPUS_SIZE)
+    if os.path.exists(path + CACHE_SUFFIX):
+        os.remove(path + CACHE_SUFFIX)
+    clear_corpus_cache()
+    WordGenerator(path, seed=1)
+
+
+@benchmark("corpus_1m_cached_load", operations=1)
+def bench_corpus_cached_load(context):
+    path = get_generated_corpus(context, LARGE_CORPUS_SIZE)
+    clear_corpus_cache()
+    WordGenerator(path, seed=1)
+
+
+def get_generated_corpus(context, word_count, counted=False):
+    name = f"words-{word_count}{'-counted' if counted else ''}.txt"
+    path = os.path.join(context["folder"].name, name)
+    if not os.path.exists(path):
+        with CorpusWriter(path) as writer:
+            for i in range(word_count):
+                writer.add_word(get_generated_word(i), word_count // (i + 1) if counted else None)
+    return path
+
+
+def get_generated_word(index):
+    letters = []
+    while True:
+        index, letter = divmod(index, 26)
+        letters.append(chr(ord("a") + letter))
+        if not index:
+            return "".join(letters)
+
+
+@benchmark("corpus_5m_weighted_load", operations=1, memory=True)
+def bench_weighted_corpus_load(context):
+    path = get_generated_corpus(context, HUGE_CORPUS_SIZE, counted=True)
+    clear_corpus_cache()
+    context["weighted_word_generator"] = WordGenerator(path, seed=1)
+
+
+@benchmark("corpus_5m_weighted_draw", operations=HUGE_CORPUS_DRAWS)
+def bench_weighted_corpus_draw(context):
+    if "weighted_word_generator" not in context:
+        bench_weighted_corpus_load(context)
+    word_generator = context["weighted_word_generator"]
+    for _ in range(HUGE_CORPUS_DRAWS // WORDS_IN_ROW):
+        word_generator.get_word_list(WORDS_IN_ROW)
+
+
+@benchmark("adaptive_1m_record_and_draw", operations=ADAPTIVE_DRAWS)
+def bench_adaptive_record_and_draw(context):
+    if "adaptive_word_generator" not in context:
+        context["adaptive_word_generator"] = WordGenerator(get_generated_corpus(context, LARGE_CORPUS_SIZE),
+                                                           seed=1, adaptive=True)
+    word_generator = context["adaptive_word_generator"]
+    for i in range(ADAPTIVE_DRAWS):
+        word_generator.record_result(word_generator.get_word(), i % 5 != 0)
+
+
+@benchmark("wordgenerator_sample_rows", operations=10000)
+def bench_wordgenerator_sample(context):
+    word_generator = context["word_generator"]
+    for _ in range(10000):
+        word_generator.get_word_list(WORDS_IN_ROW)
+
+
+class RescanningStatistics:
+    def __init__(self):
+        self.word_stats: list[WordStat] = []
+
+    def add_words(self, word: str, is_correct: bool, correct_characters: int):
+        self.word_stats.append(WordStat(word, is_correct, correct_characters))
+
+    def remove_last(self):
+        self.word_stats.pop()
+
+    def get_correct_words(self):
+        return [stat for stat in self.word_stats if stat.is_correct]
+
+    def get_correct_words_count(self):
+        return len(self.get_correct_words())
+
+    def get_correct_char_count(self):
+        return sum(len(word_stat.word) for word_stat in self.get_correct_words())
+
+
+def run_statistics_workload(statistics_, words):
+    for i, word in enumerate(words):
+        statistics_.add_words(word, i % 7 != 0, len(word) - (i % 7 == 0))
+        if i % 10 == 9:
+            statistics_.remove_last()
+        statistics_.get_correct_char_count()
+        statistics_.get_correct_words_count()
+
+
+@benchmark("statistics_add_remove_aggregate", operations=100000)
+def bench_statistics(context):
+    run_statistics_workload(Statistics(), context["words"])
+
+
+@benchmark("statistics_add_remove_rescan", operations=RESCAN_WORD_COUNT)
+def bench_statistics_rescan(context):
+    run_statistics_workload(RescanningStatistics(), context["words"][:RESCAN_WORD_COUNT])
+
+
+@benchmark("session_check_word_keystroke", operations=10000)
+def bench_session_keystroke(context):
+    session = TypingSession.from_generator(context["word_generator"])
+    for _ in range(2000):
+        word = session.get_current_word().word
+        for i in range(1, len(word) + 1):
+            session.check_word(word[:i])
+        session.move_to_next_word(word)
+
+
+@benchmark("history_batched_insert", operations=HISTORY_SESSION_COUNT)
+def bench_history_batched_insert(context):
+    from history import BATCH_SIZE
+    results = get_session_results(context)
+    return write_history(context, [results[i:i + BATCH_SIZE] for i in range(0, len(results), BATCH_SIZE)])
+
+
+@benchmark("history_per_row_insert", operations=HISTORY_SESSION_COUNT)
+def bench_history_per_row_insert(context):
+    return write_history(context, [[result] for result in get_session_results(context)])
+
+
+def get_session_results(context):
+    if "session_results" not in context:
+        from history import SessionResult
+        words = context["words"]
+        results = []
+        for i in range(HISTORY_SESSION_COUNT):
+            statistics_ = Statistics()
+            for j, word in enumerate(words[i * HISTORY_SESSION_WORDS:(i + 1) * HISTORY_SESSION_WORDS]):
+                statistics_.add_words(word, j % 7 != 0, len(word) - (j % 7 == 0))
+            results.append(SessionResult(i * 60.0, 60.0, statistics_))
+        context["session_results"] = results
+    return context["session_results"]
+
+
+def write_history(context, batches):
+    from history import HistoryStore
+    with tempfile.TemporaryDirectory() as folder:
+        store = HistoryStore(os.path.join(folder, "history.db"))
+        store.close()
+        connection = store.connect()
+        start = time.perf_counter()
+        for batch in batches:
+            HistoryStore.write_batch(connection, batch)
+        elapsed = time.perf_counter() - start
+        connection.close()
+    return elapsed
+
+
+@benchmark("chart_downsample_hour_of_ticks", operations=14400)
+def bench_chart_downsample(context):
+    from downsample import MinMaxBuckets
+    from settings import CHART_MAX_POINTS
+    points = MinMaxBuckets(CHART_MAX_POINTS)
+    words = context["words"]
+    for i in range(14400):
+        points.add(i * 0.25, len(words[i]))
+        points.get_points()
+
+
+@benchmark("simulated_60s_session", operations=1)
+def bench_simulated_session(context):
+    from loadgen import SyntheticTypist, TypistProfile
+    SyntheticTypist(TypistProfile(wpm=80), seed=1).run()
+
+
+@benchmark("gui_compare_input_keystroke", operations=1000, gui=True)
+def bench_gui_compare_input(context):
+    from frames import TextMatrixFrame
+    matrix = TextMatrixFrame(context["root"], TypingSession.from_generator(context["word_generator"]))
+    run_gui_keystrokes(context["root"], matrix, 1000)
+    matrix.destroy()
+
+
+@benchmark("gui_row_frame_creation", operations=20, gui=True)
+def bench_gui_row_frame_creation(context):
+    from frames import RowFrame
+    session = TypingSession.from_generator(context["word_generator"])
+    for i in range(20):
+        row = RowFrame(context["root"], 0)
+        row.fill(session.create_row(context["word_generator"].get_word_list(WORDS_IN_ROW)))
+        context["root"].update_idletasks()
+        row.destroy()
+
+
+@benchmark("gui_tagged_text_row_creation", operations=20, gui=True)
+def bench_gui_tagged_text_row_creation(context):
+    from frames import TaggedTextMatrixFrame
+    session = TypingSession.from_generator(context["word_generator"])
+    matrix = TaggedTextMatrixFrame(context["root"], session)
+    for i in range(20):
+        for _ in range(WORDS_IN_ROW):
+            session.type_word(session.get_current_word().word)
+        matrix.render_rows()
+        context["root"].update_idletasks()
+    matrix.destroy()
+
+
+@benchmark("gui_tagged_text_keystroke", operations=1000, gui=True)
+def bench_gui_tagged_text(context):
+    from frames import TaggedTextMatrixFrame
+    matrix = TaggedTextMatrixFrame(context["root"], TypingSession.from_generator(context["word_generator"]))
+    run_gui_keystrokes(context["root"], matrix, 1000)
+    matrix.destroy()
+
+
+@benchmark("gui_row_advance_worst_keystroke", operations=1, gui=True)
+def bench_gui_row_advance(context):
+    from frames import TextMatrixFrame
+    return run_gui_row_advance(context["root"], TextMatrixFrame, context["word_generator"])
+
+
+@benchmark("gui_burst_input_keys", operations=BURST_KEY_COUNT, gui=True)
+def bench_gui_burst_input(context):
+    from eventbus import EventBus, TextUpdated, WordSubmitted
+    from frames import TextInputFrame, TextMatrixFrame
+    from sessionstore import SessionStore
+    root = context["root"]
+    matrix = TextMatrixFrame(root, TypingSession.from_generator(context["word_generator"]))
+    event_bus = EventBus()
+    event_bus.subscribe(TextUpdated, lambda event: matrix.check_word(event.text))
+    event_bus.subscribe(WordSubmitted, lambda event: matrix.move_to_next_word(event.text))
+    text_input = TextInputFrame(root, event_bus, SessionStore())
+    count = submitted = 0
+    while count < BURST_KEY_COUNT:
+        keys = matrix.session.get_current_word().word + " "
+        for i in range(0, len(keys), BURST_LENGTH):
+            for key in keys[i:i + BURST_LENGTH]:
+                text_input.text_box.insert("end", key)
+            root.update()
+        count += len(keys)
+        submitted += 1
+    if matrix.session.statistics.get_word_count() != submitted:
+        raise ValueError(f"Burst input lost words! Expected: {submitted}; "
+                         f"received: {matrix.session.statistics.get_word_count()}")
+    text_input.destroy()
+    matrix.destroy()
+
+
+@benchmark("gui_tagged_row_advance_worst_keystroke", operations=1, gui=True)
+def bench_gui_tagged_text_row_advance(context):
+    from frames import TaggedTextMatrixFrame
+    return run_gui_row_advance(context["root"], TaggedTextMatrixFrame, context["word_generator"])
+
+
+def run_gui_row_advance(root, matrix_type, word_generator):
+    matrix = matrix_type(root, TypingSession.from_generator(word_generator))
+    worst = 0.0
+    for _ in range(20 * WORDS_IN_ROW):
+        root.update()
+        word = matrix.session.get_current_word().word
+        start = time.perf_counter()
+        matrix.move_to_next_word(word)
+        worst = max(worst, time.perf_counter() - start)
+    matrix.destroy()
+    return worst
+
+
+def run_gui_keystrokes(root, matrix, keystrokes):
+    count = 0
+    while count < keystrokes:
+        word = matrix.session.get_current_word().word
+        for i in range(1, len(word) + 1):
+            matrix.check_word(word[:i])
+            count += 1
+        matrix.move_to_next_word(word)
+        root.update_idletasks()
+
+
+def create_context(gui):
+    word_generator = WordGenerator(seed=1)
+    random_generator = random.Random(1)
+    context = {"word_generator": word_generator,
+               "words": [random_generator.choice(word_generator.words) for _ in range(100000)],
+               "folder": tempfile.TemporaryDirectory()}
+    if gui:
+        import tkinter
+        context["root"] = tkinter.Tk()
+    return context
+
+
+def start_virtual_display():
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen([xvfb, XVFB_DISPLAY, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=log)
+    socket_path = f"/tmp/.X11-unix/X{XVFB_DISPLAY.lstrip(':')}"
+    deadline = time.monotonic() + XVFB_TIMEOUT
+    while not os.path.exists(socket_path):
+        if process.poll() is not None:
+            log.seek(0)
+            error = log.read().decode(errors="replace").strip()
+            raise RuntimeError(f"Xvfb exited with code {process.returncode}: {error}")
+        if time.monotonic() > deadline:
+            process.terminate()
+            raise RuntimeError(f"Xvfb didn't open display {XVFB_DISPLAY} within {XVFB_TIMEOUT} seconds")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = XVFB_DISPLAY
+    return process
+
+
+def measure_peak_bytes(function, context):
+    tracemalloc.start()
+    try:
+        function(context)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(function, context, repeat):
+    function(context)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        elapsed = function(context)
+        timings.append(time.perf_counter() - start if elapsed is None else elapsed)
+    return timings
+
+
+def run_benchmarks(names=None, repeat=DEFAULT_REPEAT):
+    selected = {name: case for name, case in benchmarks.items() if not names or name in names}
+    gui_needed = any(gui for _, _, gui, _ in selected.values())
+    display_process = start_virtual_display() if gui_needed else None
+    gui_available = bool(os.environ.get("DISPLAY"))
+    try:
+        context = create_context(gui_needed and gui_available)
+        results = {}
+        for name, (function, operations, gui, memory) in selected.items():
+            if gui and not gui_available:
+                print(f"{name:40} skipped (no display and no Xvfb)")
+                continue
+            timings = measure(function, context, repeat)
+            results[name] = {"seconds_per_op": statistics.median(timings) / operations,
+                             "min_seconds_per_op": min(timings) / operations,
+                             "operations": operations,
+                             "repeat": repeat}
+            if memory:
+                results[name]["peak_bytes"] = measure_peak_bytes(function, context)
+            print(f"{name:40} {results[name]['seconds_per_op'] * 1e6:12.2f} us/op"
+                  + (f"  {results[name]['peak_bytes'] / 2 ** 20:8.1f} MiB peak" if memory else ""))
+        if "root" in context:
+            context["root"].destroy()
+        context["folder"].cleanup()
+    finally:
+        if display_process is not None:
+            display_process.terminate()
+    return {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, names=None):
+    regressions = []
+    for name in baseline["results"]:
+        if name not in current["results"] and (not names or name in names):
+            print(f"{name:40} MISSING")
+            regressions.append(name)
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:40} new")
+            continue
+        ratio = result["seconds_per_op"] / previous["seconds_per_op"]
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"{name:40} {ratio:8.2f}x  {status}")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_results(path, results):
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the typing test hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks and write the results")
+    run_parser.add_argument("--output", default=BASELINE_FILE)
+    compare_parser = commands.add_parser("compare", help="run the benchmarks and compare them with a baseline")
+    compare_parser.add_argument("--baseline", default=BASELINE_FILE)
+    compare_parser.add_argument("--current", help="compare this results file instead of running the benchmarks")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="allowed slowdown as a fraction, e.g. 0.2 for 20%%")
+    for command_parser in (run_parser, compare_parser):
+        command_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+        command_parser.add_argument("--only", nargs="*", choices=sorted(benchmarks), help="run only these benchmarks")
+    arguments = parser.parse_args()
+    if arguments.command == "run":
+        save_results(arguments.output, run_benchmarks(arguments.only, arguments.repeat))
+        return
+    baseline = load_results(arguments.baseline)
+    if arguments.current:
+        current = load_results(arguments.current)
+    else:
+        current = run_benchmarks(arguments.only, arguments.repeat)
+    regressions = compare_results(baseline, current, arguments.threshold, arguments.only)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) missing or regressed more than {arguments.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import hashlib
+import math
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from aliastable import AliasTable
+
+CACHE_SUFFIX = ".corpus"
+CACHE_MAGIC = b"TSCORP02"
+CACHE_HEADER = struct.Struct("<8sQQ32sQQ")
+WEIGHTED_FLAG = 1
+COUNT_SEPARATOR = "\t"
+WRITER_BLOCK_SIZE = 1 << 16
+
+_corpora = {}
+
+
+class Corpus:
+    def __init__(self, blob, offsets: array, counts: array | None = None, alias_table: AliasTable | None = None):
+        self.offsets = offsets
+        self.text = str(blob, "utf-8")
+        self.text_offsets = offsets if len(self.text) == len(blob) else self.get_text_offsets(blob)
+        self.counts = counts
+        self.alias_table = alias_table
+        if counts is not None and alias_table is None:
+            self.alias_table = AliasTable.build(counts)
+
+    def get_text_offsets(self, blob: bytes | memoryview):
+        text_offsets = array("I", [0])
+        position = 0
+        for i in range(len(self)):
+            position += len(str(blob[self.offsets[i]:self.offsets[i + 1]], "utf-8"))
+            text_offsets.append(position)
+        return text_offsets
+
+    @classmethod
+    def from_words(cls, words):
+        offsets = array("I", [0])
+        encoded = []
+        position = 0
+        for word in words:
+            data = word.encode()
+            encoded.append(data)
+            position += len(data)
+            offsets.append(position)
+        return cls(b"".join(encoded), offsets)
+
+    @classmethod
+    def from_counted_words(cls, counted_words):
+        counts = array("d")
+        words = []
+        for word, count in counted_words:
+            words.append(word)
+            counts.append(count)
+        corpus = cls.from_words(words)
+        return cls(corpus.text.encode(), corpus.offsets, counts)
+
+    def is_weighted(self):
+        return self.alias_table is not None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(f"Word doesn't exist at index: {index}")
+        return self.text[self.text_offsets[index]:self.text_offsets[index + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class CorpusWriter:
+    def __init__(self, path):
+        self.path = path
+        self.temporary_path = path + ".tmp"
+        self.file = open(self.temporary_path, "wb")
+        self.offsets_file = tempfile.TemporaryFile()
+        self.blob_file = tempfile.TemporaryFile()
+        self.digest = hashlib.sha256()
+        self.offsets = array("I", [0])
+        self.position = 0
+        self.word_count = 0
+        self.counts = array("d")
+
+    def add_word(self, word: str, count=None):
+        data = word.encode()
+        line = data + b"\n" if count is None else data + f"{COUNT_SEPARATOR}{count}\n".encode()
+        self.file.write(line)
+        self.digest.update(line)
+        self.blob_file.write(data)
+        self.position += len(data)
+        self.word_count += 1
+        self.offsets.append(self.position)
+        if len(self.offsets) >= WRITER_BLOCK_SIZE:
+            self.flush_offsets()
+        if count is not None:
+            self.counts.append(count)
+
+    def flush_offsets(self):
+        self.offsets_file.write(self.offsets.tobytes())
+        self.offsets = array("I")
+
+    def __len__(self):
+        return self.word_count
+
+    def write_arrays(self, file):
+        self.flush_offsets()
+        self.offsets_file.seek(0)
+        shutil.copyfileobj(self.offsets_file, file)
+        if self.counts:
+            alias_table = AliasTable.build(self.counts)
+            file.write(self.counts.tobytes())
+            file.write(alias_table.probabilities.tobytes())
+            file.write(alias_table.aliases.tobytes())
+        self.blob_file.seek(0)
+        shutil.copyfileobj(self.blob_file, file)
+
+    def close(self):
+        self.file.close()
+        try:
+            os.replace(self.temporary_path, self.path)
+            flags = WEIGHTED_FLAG if self.counts else 0
+            _write_cache_file(self.path + CACHE_SUFFIX, os.stat(self.path), self.digest.digest(), self.word_count,
+                              flags, self.write_arrays)
+        finally:
+            self.offsets_file.close()
+            self.blob_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        if error_type is None:
+            self.close()
+            return
+        self.file.close()
+        self.offsets_file.close()
+        self.blob_file.close()
+        os.remove(self.temporary_path)
+
+
+def load_corpus(path):
+    path = os.path.abspath(path)
+    try:
+        source_stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    cached = _corpora.get(path)
+    if cached is not None and cached[0] == (source_stat.st_mtime_ns, source_stat.st_size):
+        return cached[1]
+    corpus = _load_cached_corpus(path, source_stat)
+    _corpora[path] = ((source_stat.st_mtime_ns, source_stat.st_size), corpus)
+    return corpus
+
+
+def clear_corpus_cache():
+    _corpora.clear()
+
+
+def _load_cached_corpus(path, source_stat):
+    cache_path = path + CACHE_SUFFIX
+    cache = _read_cache(cache_path)
+    if cache is not None:
+        magic, mtime_ns, size, digest, word_count, flags = CACHE_HEADER.unpack_from(cache)
+        if (mtime_ns, size) == (source_stat.st_mtime_ns, source_stat.st_size):
+            return _parse_cache(cache, word_count, flags)
+    with open(path, "rb") as file:
+        source = file.read()
+    source_digest = hashlib.sha256(source).digest()
+    if cache is not None and digest == source_digest:
+        corpus = _parse_cache(cache, word_count, flags)
+    else:
+        corpus = _parse_source(source)
+    _write_cache(cache_path, corpus, source_stat, source_digest)
+    return corpus
+
+
+def _parse_source(source: bytes):
+    text = source.decode()
+    if COUNT_SEPARATOR in text:
+        return Corpus.from_counted_words(_split_counted_words(text))
+    return Corpus.from_words(_split_words(text))
+
+
+def _split_words(text: str):
+    for line in text.splitlines():
+        word = line.strip()
+        if word:
+            yield word
+
+
+def _split_counted_words(text: str):
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        word, _, count = line.strip().partition(COUNT_SEPARATOR)
+        word = word.strip()
+        if not word:
+            continue
+        try:
+            value = float(count) if count.strip() else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid word count on line {line_number}: {count!r}") from None
+        if not math.isfinite(value) or value < 0:
+            raise ValueError(f"Word count must be a finite number of at least 0 on line {line_number}: {count!r}")
+        yield word, value
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as file:
+            cache = file.read()
+    except OSError:
+        return None
+    if len(cache) < CACHE_HEADER.size or cache[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+        return None
+    return cache
+
+
+def _parse_cache(cache: bytes, word_count, flags):
+    view = memoryview(cache)
+    position = CACHE_HEADER.size
+    offsets, position = _read_array(view, position, "I", word_count + 1)
+    if not flags & WEIGHTED_FLAG:
+        return Corpus(view[position:], offsets)
+    counts, position = _read_array(view, position, "d", word_count)
+    probabilities, position = _read_array(view, position, "d", word_count)
+    aliases, position = _read_array(view, position, "I", word_count)
+    return Corpus(view[position:], offsets, counts, AliasTable(probabilities, aliases))
+
+
+def _read_array(view: memoryview, position, typecode, length):
+    values = array(typecode)
+    end = position + length * values.itemsize
+    values.frombytes(view[position:end])
+    return values, end
+
+
+def _write_cache(cache_path, corpus: Corpus, source_stat, source_digest):
+    flags = WEIGHTED_FLAG if corpus.is_weighted() else 0
+    _write_cache_file(cache_path, source_stat, source_digest, len(corpus), flags,
+                      lambda file: _write_corpus_arrays(file, corpus))
+
+
+def _write_corpus_arrays(file, corpus: Corpus):
+    file.write(corpus.offsets.tobytes())
+    if corpus.is_weighted():
+        file.write(corpus.counts.tobytes())
+        file.write(corpus.alias_table.probabilities.tobytes())
+        file.write(corpus.alias_table.aliases.tobytes())
+    file.write(corpus.text.encode())
+
+
+def _write_cache_file(cache_path, source_stat, source_digest, word_count, flags, write_arrays):
+    header = CACHE_HEADER.pack(CACHE_MAGIC, source_stat.st_mtime_ns, source_stat.st_size, source_digest,
+                               word_count, flags)
+    temporary_path = cache_path + ".tmp"
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(header)
+            write_arrays(file)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
@@ -0,0 +1,62 @@
+MIN_X = 0
+MIN_Y = 1
+MAX_X = 2
+MAX_Y = 3
+COUNT = 4
+
+
+class MinMaxBuckets:
+    def __init__(self, max_points):
+        if max_points < 4:
+            raise ValueError(f"Need room for at least 4 points, got: {max_points}")
+        self.max_buckets = max_points // 2
+        self.bucket_size = 1
+        self.buckets = []
+
+    def add(self, x, y):
+        if self.buckets and self.buckets[-1][COUNT] < self.bucket_size:
+            bucket = self.buckets[-1]
+            if y < bucket[MIN_Y]:
+                bucket[MIN_X], bucket[MIN_Y] = x, y
+            if y >= bucket[MAX_Y]:
+                bucket[MAX_X], bucket[MAX_Y] = x, y
+            bucket[COUNT] += 1
+            return
+        if len(self.buckets) == self.max_buckets:
+            self.merge_pairs()
+            self.add(x, y)
+            return
+        self.buckets.append([x, y, x, y, 1])
+
+    def merge_pairs(self):
+        merged = []
+        for i in range(0, len(self.buckets) - 1, 2):
+            merged.append(self.merge(self.buckets[i], self.buckets[i + 1]))
+        if len(self.buckets) % 2:
+            merged.append(self.buckets[-1])
+        self.buckets = merged
+        self.bucket_size *= 2
+
+    @staticmethod
+    def merge(first, second):
+        low = first if first[MIN_Y] <= second[MIN_Y] else second
+        high = second if second[MAX_Y] >= first[MAX_Y] else first
+        return [low[MIN_X], low[MIN_Y], high[MAX_X], high[MAX_Y], first[COUNT] + second[COUNT]]
+
+    def get_points(self):
+        points = []
+        for min_x, min_y, max_x, max_y, count in self.buckets:
+            if min_x == max_x:
+                points.append((min_x, min_y))
+            elif min_x < max_x:
+                points += [(min_x, min_y), (max_x, max_y)]
+            else:
+                points += [(max_x, max_y), (min_x, min_y)]
+        return points
+
+    def get_max(self):
+        return max((bucket[MAX_Y] for bucket in self.buckets), default=0)
+
+    def clear(self):
+        self.bucket_size = 1
+        self.buckets = []
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+EVENT_QUEUE_SIZE = 1024
+EVENT_BATCH_SIZE = 64
+BLOCK = "block"
+DROP = "drop"
+COALESCE = "coalesce"
+BACKPRESSURE_POLICIES = (BLOCK, DROP, COALESCE)
+
+
+@dataclass(frozen=True, slots=True)
+class SessionStarted:
+    timestamp: float = field(default_factory=time.monotonic)
+    lossy = False
+
+
+@dataclass(frozen=True, slots=True)
+class RowAdded:
+    words: list[str]
+    timestamp: float = field(default_factory=time.monotonic)
+    lossy = False
+
+
+@dataclass(frozen=True, slots=True)
+class TextUpdated:
+    text: str
+    timestamp: float = field(default_factory=time.monotonic)
+    lossy = True
+
+
+@dataclass(frozen=True, slots=True)
+class WordSubmitted:
+    text: str
+    timestamp: float = field(default_factory=time.monotonic)
+    lossy = False
+
+
+@dataclass(frozen=True, slots=True)
+class FieldCleared:
+    timestamp: float = field(default_factory=time.monotonic)
+    lossy = False
+
+
+@dataclass(frozen=True, slots=True)
+class SessionFinished:
+    duration: float
+    timestamp: float = field(default_factory=time.monotonic)
+    lossy = False
+
+
+class SubscriberTimings:
+    __slots__ = ("name", "calls", "total_seconds", "max_seconds", "errors")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.errors = 0
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def get_mean_seconds(self):
+        if not self.calls:
+            return 0.0
+        return self.total_seconds / self.calls
+
+    def get_summary(self):
+        return {"calls": self.calls,
+                "mean_us": self.get_mean_seconds() * 1e6,
+                "max_us": self.max_seconds * 1e6,
+                "errors": self.errors}
+
+
+class Subscriber:
+    __slots__ = ("handler", "timings")
+
+    def __init__(self, handler: Callable, name):
+        self.handler = handler
+        self.timings = SubscriberTimings(name)
+
+    def call(self, event):
+        start = time.perf_counter()
+        try:
+            self.handler(event)
+        finally:
+            self.timings.add(time.perf_counter() - start)
+
+
+class EventBus:
+    def __init__(self, capacity=EVENT_QUEUE_SIZE, policy=BLOCK, batch_size=EVENT_BATCH_SIZE):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.batch_size = batch_size
+        self.inline_subscribers: dict[type, list[Subscriber]] = {}
+        self.background_subscribers: dict[type, list[Subscriber]] = {}
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.worker = None
+        self.closed = False
+
+    def subscribe(self, event_type: type, handler: Callable, inline=True, name=None):
+        subscribers = self.inline_subscribers if inline else self.background_subscribers
+        name = name or getattr(handler, "__qualname__", repr(handler))
+        subscriber = Subscriber(handler, f"{event_type.__name__}:{name}")
+        subscribers.setdefault(event_type, []).append(subscriber)
+        if not inline:
+            self.start_worker()
+        return subscriber
+
+    def start_worker(self):
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.deliver_events, name="event-bus", daemon=True)
+            self.worker.start()
+
+    def publish(self, event):
+        for subscriber in self.inline_subscribers.get(type(event), ()):
+            subscriber.call(event)
+        if type(event) in self.background_subscribers:
+            self.enqueue(event)
+
+    def enqueue(self, event):
+        with self.condition:
+            if self.closed:
+                return
+            if len(self.pending) >= self.capacity and event.lossy and self.policy != BLOCK:
+                if self.policy == COALESCE and type(self.pending[-1]) is type(event):
+                    self.pending[-1] = event
+                    self.coalesced += 1
+                else:
+                    self.dropped += 1
+                return
+            while len(self.pending) >= self.capacity:
+                self.condition.wait()
+            self.pending.append(event)
+            self.condition.notify_all()
+
+    def deliver_events(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                batch = [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+                self.in_flight = len(batch)
+                self.condition.notify_all()
+            for event in batch:
+                self.deliver(event)
+            with self.condition:
+                self.in_flight = 0
+                self.condition.notify_all()
+
+    def deliver(self, event):
+        for subscriber in self.background_subscribers.get(type(event), ()):
+            try:
+                subscriber.call(event)
+            except Exception:
+                subscriber.timings.errors += 1
+
+    def flush(self):
+        with self.condition:
+            while (self.pending or self.in_flight) and self.worker is not None and self.worker.is_alive():
+                self.condition.wait()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.worker is not None:
+            self.worker.join()
+
+    def get_timings(self):
+        subscribers = [subscriber for subscribers in (self.inline_subscribers, self.background_subscribers)
+                       for event_subscribers in subscribers.values() for subscriber in event_subscribers]
+        return {subscriber.timings.name: subscriber.timings.get_summary() for subscriber in subscribers}
@@ -0,0 +1,59 @@
+from array import array
+
+
+class FenwickTree:
+    def __init__(self, weights):
+        self.size = len(weights)
+        self.values = array("d", weights)
+        self.tree = array("d", bytes(8 * (self.size + 1)))
+        tree = self.tree
+        for i, weight in enumerate(self.values, start=1):
+            tree[i] += weight
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.top_step = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def __len__(self):
+        return self.size
+
+    def get(self, index):
+        return self.values[index]
+
+    def set(self, index, weight):
+        self.add(index, weight - self.values[index])
+
+    def add(self, index, delta):
+        self.check_index(index)
+        self.values[index] += delta
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, count):
+        total = 0.0
+        i = min(count, self.size)
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def get_total(self):
+        return self.prefix_sum(self.size)
+
+    def find(self, value):
+        position = 0
+        step = self.top_step
+        tree = self.tree
+        while step:
+            next_position = position + step
+            if next_position <= self.size and tree[next_position] <= value:
+                position = next_position
+                value -= tree[next_position]
+            step >>= 1
+        return min(position, self.size - 1)
+
+    def check_index(self, index):
+        if index < 0 or index >= self.size:
+            raise IndexError(f"Weight doesn't exist at index: {index}")
@@ -1,12 +1,45 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from settings import *
-from notifier import UpdateNotifier
-from wordgenerator import WordGenerator
+from eventbus import EventBus, TextUpdated, WordSubmitted, FieldCleared
 from stats import Statistics
+from typingsession import TypingSession, WordState, PENDING, CORRECT, WRONG
+from sessionstore import SessionStore
+from latency import latency_probe
+from downsample import MinMaxBuckets
 from typing import Callable
 
 MATRIX_WIDTH = 500
 MATRIX_HEIGHT = 400
+WORD_SEPARATOR = "  "
+STATE_TAGS = {PENDING: "pending", CORRECT: "correct", WRONG: "wrong"}
+CHART_WIDTH = 500
+CHART_HEIGHT = 120
+CHART_PADDING = 8
+CHART_MIN_WPM = 60
+
+
+class RenderCounter:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.tk_calls = 0
+        self.keystrokes = 0
+
+    def add_call(self):
+        self.tk_calls += 1
+
+    def add_keystroke(self):
+        self.keystrokes += 1
+
+    def get_calls_per_keystroke(self):
+        if not self.keystrokes:
+            return 0
+        return self.tk_calls / self.keystrokes
+
+
+render_counter = RenderCounter()
 
 
 class ButtonFrame(tk.Frame):
@@ -59,6 +92,7 @@ class StatisticsFrame(tk.Frame):
         self.cpm_label = self.create_cpm_label()
         self.wpm_label = self.create_wpm_label()
         self.timer_label = self.create_timer_label()
+        self.ranking_label = self.create_ranking_label()
 
     def create_leading_labels(self):
         self.create_leading_label(text="Corrected CPM:", column=0)
@@ -92,50 +126,104 @@ class StatisticsFrame(tk.Frame):
     def create_timer_label(self):
         return self.create_value_label(text=TIMER_LENGTH, column=5)
 
-    def update_labels(self):
-        cpm = self.statistics.get_correct_char_count()
+    def create_ranking_label(self):
+        label = tk.Label(self, text="", background=BLUE, foreground=CREAM, font=(FONT_NAME, STAT_SIZE))
+        label.grid(column=0, row=1, columnspan=6, sticky="")
+        return label
+
+    def update_ranking_label(self, ranks: dict | None):
+        if ranks is None or ranks["everyone"]["cpm"] is None:
+            self.ranking_label.configure(text="")
+            return
+        text = f"You beat {ranks['everyone']['cpm']:.0%} of runs"
+        if ranks["user"] is not None and ranks["user"]["cpm"] is not None:
+            text += f" and {ranks['user']['cpm']:.0%} of your own"
+        self.ranking_label.configure(text=text)
+
+    def update_labels(self, elapsed):
+        cpm = self.statistics.get_chars_per_minute(elapsed)
         self.cpm_label.configure(text=cpm)
-        wpm = self.statistics.get_correct_words_count()
+        wpm = self.statistics.get_words_per_minute(elapsed)
         self.wpm_label.configure(text=wpm)
 
     def update_timer_label(self, timer_count):
         self.timer_label.configure(text=timer_count)
 
 
+class ChartFrame(tk.Frame):
+    def __init__(self, parent, statistics: Statistics):
+        super().__init__(master=parent, background=BLUE)
+        self.grid(column=0, row=5, sticky='', padx=10, pady=10)
+        self.statistics = statistics
+        self.wpm_points = MinMaxBuckets(CHART_MAX_POINTS)
+        self.accuracy_points = MinMaxBuckets(CHART_MAX_POINTS)
+        self.canvas = tk.Canvas(self, width=CHART_WIDTH, height=CHART_HEIGHT, background=CREAM, highlightthickness=0)
+        self.canvas.grid(column=0, row=0)
+        self.wpm_line = self.create_line(BLUE)
+        self.accuracy_line = self.create_line(GREEN)
+        self.legend = self.canvas.create_text(CHART_PADDING, CHART_PADDING, anchor="nw", fill=BLUE,
+                                              font=(FONT_NAME, STAT_SIZE - 4), text="")
+
+    def create_line(self, color):
+        return self.canvas.create_line(0, 0, 0, 0, fill=color, width=2, state="hidden")
+
+    def update_chart(self, elapsed, now):
+        wpm, accuracy = self.statistics.get_rolling_rates(now, CHART_WINDOW, elapsed)
+        self.wpm_points.add(elapsed, wpm)
+        if accuracy is not None:
+            self.accuracy_points.add(elapsed, accuracy)
+        x_range = max(TIMER_LENGTH, elapsed)
+        self.set_line(self.wpm_line, self.wpm_points, x_range, max(CHART_MIN_WPM, self.wpm_points.get_max()))
+        self.set_line(self.accuracy_line, self.accuracy_points, x_range, 100)
+        accuracy_text = "-" if accuracy is None else f"{accuracy:.0f}%"
+        self.canvas.itemconfigure(self.legend, text=f"WPM {wpm:.0f}  Accuracy {accuracy_text}")
+
+    def set_line(self, line, points: MinMaxBuckets, x_range, y_range):
+        coordinates = []
+        width = CHART_WIDTH - 2 * CHART_PADDING
+        height = CHART_HEIGHT - 2 * CHART_PADDING
+        for x, y in points.get_points():
+            coordinates.append(CHART_PADDING + x / x_range * width)
+            coordinates.append(CHART_HEIGHT - CHART_PADDING - min(y / y_range, 1) * height)
+        if len(coordinates) < 4:
+            self.canvas.itemconfigure(line, state="hidden")
+            return
+        self.canvas.coords(line, coordinates)
+        self.canvas.itemconfigure(line, state="normal")
+
+    def clear(self):
+        self.wpm_points.clear()
+        self.accuracy_points.clear()
+        for line in (self.wpm_line, self.accuracy_line):
+            self.canvas.itemconfigure(line, state="hidden")
+        self.canvas.itemconfigure(self.legend, text="")
+
+
 class TextMatrixFrame(tk.Frame):
-    def __init__(self, parent, starting_words: list[list[str]], statistics: Statistics):
+    def __init__(self, parent, session: TypingSession):
         super().__init__(master=parent, background=CREAM)
         self.grid(column=0, row=2, sticky='', padx=10, pady=10)
         self.configure(width=MATRIX_WIDTH, height=MATRIX_HEIGHT)
-        self.word_generator = WordGenerator()
-        self.statistics = statistics
-        self.row_frames = self.init_rows(starting_words)
-        self.column_counter = 0
-        self.row_counter = 0
+        self.session = session
+        self.row_pool = [RowFrame(self, i) for i in range(ROWS_OF_WORDS + 1)]
+        self.row_slots: dict[int, RowFrame] = {}
+        self.prepared_rows: dict[int, RowFrame] = {}
+        self.pending_prerender = None
+        for row in self.row_pool:
+            row.hide()
+        self.show_current_rows()
         self.highlight_word()
-
-    def init_rows(self, starting_words: list[list[str]]):
-        self.check_starting_words(starting_words)
-        rows = []
-        for i in range(ROWS_OF_WORDS):
-            words = starting_words[i]
-            row = RowFrame(self, i, words)
-            rows.append(row)
-        return rows
-
-    @staticmethod
-    def check_starting_words(starting_words: list[list[str]]):
-        if len(starting_words) != ROWS_OF_WORDS:
-            raise ValueError(f"Unexpected number of rows in starting words! Expected: {ROWS_OF_WORDS}; "
-                             f"received: {len(starting_words)}")
+        self.schedule_prerender()
 
     def highlight_word(self):
-        word = self.get_word(self.row_counter, self.column_counter)
-        word.highlight()
+        self.render_word(*self.session.get_position(), highlighted=True)
 
-    def un_highlight_word(self):
-        word = self.get_word(self.row_counter, self.column_counter)
-        word.un_highlight()
+    def un_highlight_word(self, row_index, column_index):
+        self.render_word(row_index, column_index, highlighted=False)
+
+    def render_word(self, row_index, column_index, highlighted):
+        word = self.get_word(row_index, column_index)
+        word.render(highlighted)
 
     def get_word(self, row_index, column_index):
         row = self.get_row(row_index)
@@ -143,127 +231,254 @@ class TextMatrixFrame(tk.Frame):
 
     def get_row(self, row_index):
         self.check_row_exist(row_index)
-        return self.row_frames[row_index]
+        return self.row_slots[row_index]
 
     def check_row_exist(self, row_index):
-        if row_index < 0 or row_index >= len(self.row_frames):
-            raise IndexError(f"Row doesn't exist at index: {row_index}")
+        if row_index not in self.row_slots:
+            raise IndexError(f"Row isn't shown at index: {row_index}")
 
     def check_word(self, current_input):
-        word = self.get_word(self.row_counter, self.column_counter)
-        word.compare_input(current_input)
+        render_counter.add_keystroke()
+        self.session.check_word(current_input)
+        latency_probe.mark("session")
+        self.highlight_word()
+        latency_probe.mark("recolor")
 
-    def hide_row(self, index):
-        row = self.get_row(index)
+    def show_current_rows(self):
+        start, end = self.session.get_current_row_range()
+        for row_index in [index for index in self.row_slots if not start <= index < end]:
+            self.release_row(self.row_slots.pop(row_index))
+        for position, row_index in enumerate(range(start, end)):
+            row = self.row_slots.get(row_index)
+            if row is None:
+                row = self.take_row(row_index)
+                self.row_slots[row_index] = row
+            row.shift(position)
+
+    def take_row(self, row_index):
+        words = self.session.rows[row_index]
+        row = self.prepared_rows.pop(row_index, None)
+        if row is not None:
+            row.fill(words, start=row.filled_words)
+            return row
+        row = self.row_pool.pop()
+        row.fill(words)
+        return row
+
+    def release_row(self, row):
         row.hide()
+        self.row_pool.append(row)
 
-    def show_row(self, index):
-        row = self.get_row(index)
-        row.show()
+    def schedule_prerender(self):
+        if self.pending_prerender is None:
+            self.pending_prerender = self.after_idle(self.prerender_next_row)
 
-    def create_new_row(self):
-        words = self.word_generator.get_word_list(WORDS_IN_ROW)
-        new_row = RowFrame(self, len(self.row_frames), words)
-        self.row_frames.append(new_row)
+    def prerender_next_row(self):
+        self.pending_prerender = None
+        row_index = self.session.get_next_row_range()[1] - 1
+        if row_index in self.row_slots:
+            return
+        row = self.prepared_rows.get(row_index)
+        if row is None:
+            for stale_index in list(self.prepared_rows):
+                self.release_row(self.prepared_rows.pop(stale_index))
+            self.session.prepare_row(row_index)
+            row = self.row_pool.pop()
+            row.start_fill()
+            self.prepared_rows[row_index] = row
+            self.schedule_prerender()
+            return
+        words = self.session.rows[row_index]
+        if row.filled_words < len(words):
+            row.fill_word(row.filled_words, words[row.filled_words])
+            self.schedule_prerender()
 
-    def get_number_of_rows(self):
-        return len(self.row_frames) - 1
+    def destroy(self):
+        if self.pending_prerender is not None:
+            self.after_cancel(self.pending_prerender)
+            self.pending_prerender = None
+        super().destroy()
 
     def move_to_next_word(self, current_input):
-        self.final_check(current_input)
-        self.un_highlight_word()
-        self.increment_counters()
+        previous_position = self.session.get_position()
+        row_changed = self.session.move_to_next_word(current_input)
+        self.un_highlight_word(*previous_position)
+        if row_changed:
+            self.show_current_rows()
+            self.schedule_prerender()
         self.highlight_word()
 
-    def final_check(self, current_input):
-        self.add_statistics(current_input)
-        word = self.get_word(self.row_counter, self.column_counter)
-        word.check_remainder(current_input, RED)
-
-    def add_statistics(self, current_input: str):
-        word = self.get_word(self.row_counter, self.column_counter)
-        if word.word == current_input:
-            self.statistics.add_words(word.word, True, len(word.word))
-            return
-        self.statistics.add_words(word.word, False, word.get_correct_letter_count())
-
-    def increment_counters(self):
-        if self.is_last_in_row():
-            self.hide_current_rows()
-            self.row_counter += 1
-            self.column_counter = 0
-            self.check_to_add_new_row()
+    def move_to_previous_word(self):
+        previous_position = self.session.get_position()
+        row_changed = self.session.move_to_previous_word()
+        self.un_highlight_word(*previous_position)
+        if row_changed:
             self.show_current_rows()
-        else:
-            self.column_counter += 1
+            self.schedule_prerender()
+        self.highlight_word()
 
-    def is_last_in_row(self):
-        return self.column_counter == WORDS_IN_ROW - 1
 
-    def move_to_previous_word(self):
-        self.statistics.remove_last()
-        self.un_highlight_word()
-        self.decrement_counters()
+class TaggedTextMatrixFrame(tk.Frame):
+    text_font = None
+
+    def __init__(self, parent, session: TypingSession):
+        super().__init__(master=parent, background=CREAM)
+        self.grid(column=0, row=2, sticky='', padx=10, pady=10)
+        self.session = session
+        self.font = self.get_text_font()
+        self.text = self.create_text()
+        self.create_tags()
+        self.word_positions = {}
+        self.render_rows()
+
+    @classmethod
+    def get_text_font(cls):
+        if cls.text_font is None:
+            cls.text_font = tkfont.Font(family=FONT_NAME, size=TEXT_SIZE, weight="bold")
+        return cls.text_font
+
+    def create_text(self):
+        text = tk.Text(self,
+                       font=self.font,
+                       width=MATRIX_WIDTH // self.font.measure("0"),
+                       height=ROWS_OF_WORDS,
+                       wrap="none",
+                       foreground=BLUE,
+                       background=CREAM,
+                       borderwidth=0,
+                       highlightthickness=0,
+                       cursor="arrow",
+                       takefocus=0,
+                       spacing1=6,
+                       spacing3=6,
+                       state="disabled")
+        text.grid(column=0, row=0, sticky="", padx=7, pady=7)
+        return text
+
+    def create_tags(self):
+        self.text.tag_configure("row", justify="center")
+        self.text.tag_configure("pending", foreground=BLUE)
+        self.text.tag_configure("highlight", background=BLUE, foreground=CREAM)
+        self.text.tag_configure("correct", foreground=GREEN)
+        self.text.tag_configure("wrong", foreground=RED)
+
+    def render_rows(self):
+        self.word_positions = {}
+        segments = []
+        longest_row = 0
+        start, end = self.session.get_current_row_range()
+        for line, row_index in enumerate(range(start, end), start=1):
+            if line > 1:
+                segments += ["\n", "row"]
+            offset = 0
+            for column_index, word in enumerate(self.session.rows[row_index]):
+                if column_index:
+                    segments += [WORD_SEPARATOR, "row"]
+                    offset += len(WORD_SEPARATOR)
+                self.word_positions[(row_index, column_index)] = (line, offset)
+                for run_start, run_end, state in self.get_state_runs(word):
+                    segments += [word.word[run_start:run_end], ("row", STATE_TAGS[state])]
+                offset += len(word.word)
+            longest_row = max(longest_row, offset)
+        self.fit_width(longest_row)
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", *segments)
+        self.text.configure(state="disabled")
         self.highlight_word()
 
-    def decrement_counters(self):
-        if self.column_counter == 0 and self.row_counter != 0:
-            self.hide_current_rows()
-            self.row_counter -= 1
-            self.column_counter = WORDS_IN_ROW - 1
-            self.show_current_rows()
-        elif self.column_counter != 0:
-            self.column_counter -= 1
-
-    def check_to_add_new_row(self):
-        if self.is_last_row():
-            self.create_new_row()
-
-    def hide_current_rows(self):
-        start, end = self.get_current_row_range()
-        for i in range(start, end):
-            self.hide_row(i)
-
-    def get_current_row_range(self):
-        if self.row_counter < (ROWS_OF_WORDS - 1):
-            start = 0
-            end = ROWS_OF_WORDS
-        else:
-            start = self.row_counter - 1
-            end = self.row_counter + 2
-        return start, end
+    def fit_width(self, longest_row):
+        if longest_row > int(self.text.cget("width")):
+            self.text.configure(width=longest_row)
 
-    def show_current_rows(self):
-        start, end = self.get_current_row_range()
-        for i in range(start, end):
-            self.show_row(i)
+    @staticmethod
+    def get_state_runs(word: WordState):
+        runs = []
+        states = word.letter_states
+        run_start = 0
+        for i in range(1, len(states) + 1):
+            if i == len(states) or states[i] != states[run_start]:
+                runs.append((run_start, i, states[run_start]))
+                run_start = i
+        return runs
+
+    def highlight_word(self):
+        self.render_word(*self.session.get_position(), highlighted=True)
+
+    def render_word(self, row_index, column_index, highlighted):
+        position = self.word_positions.get((row_index, column_index))
+        if position is None:
+            return
+        line, offset = position
+        word = self.session.get_word(row_index, column_index)
+        word_start = f"{line}.{offset}"
+        word_end = f"{line}.{offset + len(word.word)}"
+        for tag in ("highlight", *STATE_TAGS.values()):
+            self.text.tag_remove(tag, word_start, word_end)
+        for run_start, run_end, state in self.get_state_runs(word):
+            self.text.tag_add(STATE_TAGS[state], f"{line}.{offset + run_start}", f"{line}.{offset + run_end}")
+        if highlighted:
+            self.text.tag_add("highlight", word_start, word_end)
+
+    def check_word(self, current_input):
+        self.session.check_word(current_input)
+        latency_probe.mark("session")
+        self.highlight_word()
+        latency_probe.mark("recolor")
+
+    def move_to_next_word(self, current_input):
+        previous_position = self.session.get_position()
+        row_changed = self.session.move_to_next_word(current_input)
+        self.move_highlight(previous_position, row_changed)
+
+    def move_to_previous_word(self):
+        previous_position = self.session.get_position()
+        row_changed = self.session.move_to_previous_word()
+        self.move_highlight(previous_position, row_changed)
 
-    def is_last_row(self):
-        return self.row_counter == self.get_number_of_rows()
+    def move_highlight(self, previous_position, row_changed):
+        if row_changed:
+            self.render_rows()
+            return
+        self.render_word(*previous_position, highlighted=False)
+        self.highlight_word()
 
 
 class RowFrame(tk.Frame):
-    def __init__(self, parent, row_index, words: list[str]):
+    def __init__(self, parent, row_index):
         super().__init__(master=parent, width=MATRIX_WIDTH, height=MATRIX_HEIGHT / ROWS_OF_WORDS, background=CREAM)
         self.row_index = row_index
+        self.shown = False
         self.show()
-        self.word_frames = self.fill(words)
+        self.word_frames: list[WordFrame] = []
+        self.filled_words = 0
 
-    def fill(self, words: list[str]):
-        if not words:
-            return
-        word_frames = []
-        for i, word in enumerate(words):
-            word_frames.append(self.create_word_frame(word, i))
-        return word_frames
+    def fill(self, words: list[WordState], start=0):
+        for i in range(start, len(words)):
+            self.fill_word(i, words[i])
+        for word_frame in self.word_frames[len(words):]:
+            word_frame.grid_remove()
+
+    def start_fill(self):
+        self.filled_words = 0
 
-    def create_word_frame(self, text, column):
-        word_frame = WordFrame(self, column, text)
+    def fill_word(self, column, word: WordState):
+        if column < len(self.word_frames):
+            self.word_frames[column].set_word(word)
+        else:
+            self.word_frames.append(self.create_word_frame(word, column))
+        self.word_frames[column].render(highlighted=False)
+        self.filled_words = column + 1
+
+    def create_word_frame(self, word_state, column):
+        word_frame = WordFrame(self, column, word_state)
         word_frame.grid(row=0, column=column, sticky="w")
         return word_frame
 
     def shift(self, new_index):
-        self.grid(column=0, row=new_index, sticky="")
+        if new_index != self.row_index or not self.shown:
+            self.row_index = new_index
+            self.show()
 
     def get_word(self, index):
         self.check_word_exist(index)
@@ -275,156 +490,162 @@ class RowFrame(tk.Frame):
 
     def show(self):
         self.grid(column=0, row=self.row_index, sticky="", pady=2)
+        self.shown = True
 
     def hide(self):
         self.grid_remove()
+        self.shown = False
 
 
 class WordFrame(tk.Frame):
-    def __init__(self, parent, column, word):
+    def __init__(self, parent, column, word_state: WordState):
         super().__init__(master=parent, background=CREAM)
         self.grid(row=0, column=column, sticky="w", padx=7)
-        self.word = word
-        self.letter_labels = self.create_labels()
-
-    def create_labels(self):
-        labels = []
+        self.letter_labels: list[tk.Label] = []
+        self.label_texts = []
+        self.label_colors = []
+        self.shown_labels = 0
+        self.set_word(word_state)
+
+    def set_word(self, word_state: WordState):
+        self.word_state = word_state
+        self.word = word_state.word
         for i, letter in enumerate(self.word):
-            label = tk.Label(self, text=letter, foreground=BLUE, padx=0, font=(FONT_NAME, TEXT_SIZE, "bold"),
-                             background=CREAM)
-            label.grid(row=0, column=i, sticky="w")
-            labels.append(label)
-        return labels
-
-    def highlight(self):
-        for label in self.letter_labels:
-            label.configure(background=BLUE, foreground=CREAM)
-
-    def un_highlight(self):
-        for label in self.letter_labels:
-            color = label.cget("foreground")
-            if color == RED or color == GREEN:
-                label.configure(background=CREAM)
+            if i < len(self.letter_labels):
+                self.reuse_label(i, letter)
             else:
-                label.configure(background=CREAM, foreground=BLUE)
-
-    def compare_input(self, current_input):
-        for i, letter in enumerate(current_input):
-            if self.is_out_of_range(i):
-                self.set_word_color(RED)
-                break
-            self.compare_letter(letter, i)
-        self.check_remainder(current_input, CREAM)
-
-    def compare_letter(self, letter, index):
-        if self.is_correct(letter, index):
-            self.set_letter_color(index, GREEN)
-        else:
-            self.set_letter_color(index, RED)
-
-    def is_out_of_range(self, index):
-        return index >= len(self.word)
-
-    def is_correct(self, letter, index):
-        return letter == self.word[index]
-
-    def set_letter_color(self, index, color):
-        letter_label = self.letter_labels[index]
-        letter_label.configure(foreground=color)
-
-    def set_word_color(self, color):
-        for letter in self.letter_labels:
-            letter.configure(foreground=color)
-
-    def check_remainder(self, current_input, remainder_color):
-        if self.is_input_shorter(current_input):
-            self.set_color_for_remainder(current_input, remainder_color)
-
-    def set_color_for_remainder(self, current_input, color):
-        for i in range(len(current_input), len(self.word)):
-            self.set_letter_color(i, color)
-
-    def is_input_shorter(self, current_input):
-        return len(current_input) < len(self.word)
+                self.letter_labels.append(self.create_label(i, letter))
+                self.label_texts.append(letter)
+                self.label_colors.append((BLUE, CREAM))
+        for label in self.letter_labels[len(self.word):self.shown_labels]:
+            label.grid_remove()
+        self.shown_labels = len(self.word)
+
+    def create_label(self, column, letter):
+        label = tk.Label(self, text=letter, foreground=BLUE, padx=0, font=(FONT_NAME, TEXT_SIZE, "bold"),
+                         background=CREAM)
+        label.grid(row=0, column=column, sticky="w")
+        return label
 
-    def is_input_longer(self, current_input):
-        return len(current_input) > len(self.word)
+    def reuse_label(self, column, letter):
+        label = self.letter_labels[column]
+        if self.label_texts[column] != letter:
+            label.configure(text=letter)
+            self.label_texts[column] = letter
+        if column >= self.shown_labels:
+            label.grid()
+
+    def render(self, highlighted):
+        background = BLUE if highlighted else CREAM
+        for i, state in enumerate(self.word_state.letter_states):
+            colors = (self.get_letter_color(state, highlighted), background)
+            if self.label_colors[i] != colors:
+                self.set_label_colors(i, colors)
+
+    def set_label_colors(self, index, colors):
+        foreground, background = colors
+        self.letter_labels[index].configure(foreground=foreground, background=background)
+        self.label_colors[index] = colors
+        render_counter.add_call()
 
-    def get_correct_letter_count(self):
-        correct_letters = [letter for letter in self.letter_labels if letter.cget("foreground") == GREEN]
-        return len(correct_letters)
+    @staticmethod
+    def get_letter_color(state, highlighted):
+        if state == CORRECT:
+            return GREEN
+        if state == WRONG:
+            return RED
+        return CREAM if highlighted else BLUE
 
 
 class TextInputFrame(tk.Frame):
-    def __init__(self, parent, update_notifier: UpdateNotifier):
+    def __init__(self, parent, event_bus: EventBus, store: SessionStore):
         super().__init__(master=parent, background=BLUE)
         self.grid(column=0, row=3, sticky="")
         self.current_input = tk.StringVar(value="")
         self.text_box = tk.Entry(self, textvariable=self.current_input, foreground=BLUE, font=(FONT_NAME, TEXT_SIZE))
         self.text_box.grid(column=0, row=0, sticky="", pady=10)
-        self.typed_in_words = []
+        self.store = store
         self.last_value = ""
-        self.is_reset = False
+        self.processed_value = ""
+        self.pending_check = None
+        self.setting_input = False
         # self.text_box.bind("<space>", self.word_finished)
         self.text_box.bind("<BackSpace>", self.check_word_cleared)
         self.text_box.bind("<Key>", self.set_last_value)
-        self.update_notifier: UpdateNotifier = update_notifier
+        self.event_bus = event_bus
         self.add_trace()
 
     def add_trace(self):
-        self.current_input.trace_add(mode='write', callback=self.check_input)
+        self.current_input.trace_add(mode='write', callback=self.schedule_input_check)
+
+    def schedule_input_check(self, var, index, mode):
+        if self.pending_check is None and not self.setting_input:
+            latency_probe.start()
+            self.pending_check = self.after_idle(self.check_input)
+
+    def flush_input(self):
+        if self.pending_check is not None:
+            self.after_cancel(self.pending_check)
+            self.check_input()
 
-    def check_input(self, var, index, mode):
+    def check_input(self):
+        self.pending_check = None
         current_input = self.current_input.get()
-        if current_input == " ":
-            self.clear_space()
+        if current_input == self.processed_value:
             return
-        if self.is_input_submitted():
-            self.word_finished()
+        if " " in current_input:
+            self.submit_words(current_input)
             return
-        if self.is_reset:
-            self.is_reset = False
-            return
-        self.send_notifier()
+        self.processed_value = current_input
+        self.publish_text(current_input)
+
+    def submit_words(self, current_input):
+        while " " in current_input:
+            word, _, current_input = current_input.partition(" ")
+            if word:
+                self.word_finished(word)
+        self.set_input(current_input)
+        if current_input:
+            self.publish_text(current_input)
+
+    def set_input(self, value):
+        self.processed_value = value
+        self.setting_input = True
+        try:
+            self.current_input.set(value)
+        finally:
+            self.setting_input = False
+        self.text_box.icursor("end")
 
     def set_last_value(self, event):
         self.last_value = self.current_input.get()
 
-    def send_notifier(self):
-        self.update_notifier.text_updated(self.current_input.get())
-
-    def is_input_submitted(self):
-        return " " in self.current_input.get()
+    def publish_text(self, current_input):
+        self.event_bus.publish(TextUpdated(current_input))
 
-    def word_finished(self):
-        self.last_value = self.current_input.get().strip()
-        self.typed_in_words.append(self.last_value)
-        self.current_input.set("")
-        self.update_notifier.word_submitted(self.last_value)
+    def word_finished(self, word):
+        self.last_value = word
+        self.store.push_typed(self.last_value)
+        self.event_bus.publish(WordSubmitted(self.last_value))
 
     def check_word_cleared(self, event):
+        self.flush_input()
         current_value = self.text_box.get()
         if current_value == "" and self.last_value != "":
             self.last_value = ""
         if current_value == "" and self.last_value == "":
             self.get_last_word()
 
-    def clear_space(self):
-        self.current_input.set("")
-        self.text_box.update()
-
     def get_last_word(self):
-        if not self.typed_in_words:
+        last_word = self.store.get_last_typed()
+        if last_word is None:
             return
-        self.is_reset = True
-        self.current_input.set(self.typed_in_words[-1] + "*")
-        self.text_box.icursor(len(self.typed_in_words[-1]) + 1)
-        self.typed_in_words.pop()
-        self.text_box.update()
-        self.update_notifier.field_cleared()
+        self.set_input(last_word + "*")
+        self.store.pop_typed()
+        self.event_bus.publish(FieldCleared())
 
     def show(self):
-        self.current_input.set("")
+        self.set_input("")
         self.grid(column=0, row=3, sticky="")
 
     def hide(self):
@@ -432,7 +653,5 @@ class TextInputFrame(tk.Frame):
 
     def clear(self):
         self.last_value = ""
-        self.typed_in_words = []
-        self.current_input.set("")
-        self.text_box.update()
-
+        self.store.clear_typed()
+        self.set_input("")
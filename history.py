@@ -0,0 +1,160 @@
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+from stats import Statistics
+
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    duration REAL NOT NULL,
+    word_count INTEGER NOT NULL,
+    correct_word_count INTEGER NOT NULL,
+    char_count INTEGER NOT NULL,
+    correct_char_count INTEGER NOT NULL,
+    error_char_count INTEGER NOT NULL,
+    wpm REAL NOT NULL,
+    cpm REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_started_at ON sessions (started_at DESC);
+CREATE INDEX IF NOT EXISTS sessions_day_wpm ON sessions (day, wpm DESC);
+CREATE TABLE IF NOT EXISTS daily_best (
+    day TEXT PRIMARY KEY,
+    wpm REAL NOT NULL,
+    session_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS word_stats (
+    session_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    is_correct INTEGER NOT NULL,
+    correct_characters INTEGER NOT NULL,
+    PRIMARY KEY (session_id, position)
+) WITHOUT ROWID;
+"""
+
+INSERT_SESSION = """
+INSERT INTO sessions (started_at, day, duration, word_count, correct_word_count, char_count,
+                      correct_char_count, error_char_count, wpm, cpm)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_DAILY_BEST = """
+INSERT INTO daily_best (day, wpm, session_id) VALUES (?, ?, ?)
+ON CONFLICT (day) DO UPDATE SET wpm = excluded.wpm, session_id = excluded.session_id
+WHERE excluded.wpm > daily_best.wpm
+"""
+
+INSERT_WORD = "INSERT INTO word_stats VALUES (?, ?, ?, ?, ?)"
+
+SESSION_COLUMNS = ("id", "started_at", "day", "duration", "word_count", "correct_word_count", "char_count",
+                   "correct_char_count", "error_char_count", "wpm", "cpm")
+
+
+class SessionResult:
+    def __init__(self, started_at: float, duration: float, statistics: Statistics):
+        self.started_at = started_at
+        self.day = time.strftime("%Y-%m-%d", time.localtime(started_at))
+        self.duration = duration
+        self.word_count = statistics.get_word_count()
+        self.correct_word_count = statistics.get_correct_words_count()
+        self.char_count = statistics.get_char_count()
+        self.correct_char_count = statistics.get_correct_char_count()
+        self.error_char_count = statistics.get_error_char_count()
+        self.wpm = statistics.get_words_per_minute(duration)
+        self.cpm = statistics.get_chars_per_minute(duration)
+        self.words = [(stat.word, stat.is_correct, stat.correct_characters) for stat in statistics.get_word_stats()]
+
+    def get_row(self):
+        return (self.started_at, self.day, self.duration, self.word_count, self.correct_word_count,
+                self.char_count, self.correct_char_count, self.error_char_count, self.wpm, self.cpm)
+
+
+class HistoryStore:
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.results = queue.Queue()
+        self.failed_batches = 0
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+        self.reader = self.connect()
+        self.writer = threading.Thread(target=self.write_results, name="history-writer", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def add_session(self, result: SessionResult):
+        self.results.put(result)
+
+    def write_results(self):
+        connection = self.connect()
+        running = True
+        while running:
+            batch = []
+            try:
+                batch.append(self.results.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self.results.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:
+                running = False
+                batch = [result for result in batch if result is not None]
+            if batch:
+                try:
+                    self.write_batch(connection, batch)
+                except Exception:
+                    self.failed_batches += 1
+                    traceback.print_exc()
+            for _ in range(len(batch) + (0 if running else 1)):
+                self.results.task_done()
+        connection.close()
+
+    @staticmethod
+    def write_batch(connection: sqlite3.Connection, batch: list[SessionResult]):
+        words = []
+        with connection:
+            for result in batch:
+                session_id = connection.execute(INSERT_SESSION, result.get_row()).lastrowid
+                connection.execute(UPDATE_DAILY_BEST, (result.day, result.wpm, session_id))
+                words.extend((session_id, position, *word) for position, word in enumerate(result.words))
+            connection.executemany(INSERT_WORD, words)
+
+    def flush(self):
+        self.results.join()
+
+    def close(self):
+        if not self.writer.is_alive():
+            return
+        self.results.put(None)
+        self.writer.join()
+        self.reader.close()
+
+    def get_best_wpm_per_day(self, days=None):
+        query = "SELECT day, wpm, session_id FROM daily_best ORDER BY day DESC"
+        if days is not None:
+            return self.reader.execute(query + " LIMIT ?", (days,)).fetchall()
+        return self.reader.execute(query).fetchall()
+
+    def get_recent_sessions(self, count):
+        query = f"SELECT {', '.join(SESSION_COLUMNS)} FROM sessions ORDER BY started_at DESC LIMIT ?"
+        return [dict(zip(SESSION_COLUMNS, row)) for row in self.reader.execute(query, (count,))]
+
+    def get_session_scores(self):
+        return self.reader.execute("SELECT cpm, wpm, char_count, error_char_count FROM sessions")
+
+    def get_session_words(self, session_id):
+        query = "SELECT word, is_correct, correct_characters FROM word_stats WHERE session_id = ? ORDER BY position"
+        return self.reader.execute(query, (session_id,)).fetchall()
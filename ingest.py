@@ -0,0 +1,125 @@
+import argparse
+import os
+import re
+import unicodedata
+from collections import Counter
+from corpus import CorpusWriter
+
+CHUNK_SIZE = 1 << 20
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+QUOTE_PATTERN = re.compile(r"\S+")
+APOSTROPHES = str.maketrans({"’": "'", "‘": "'"})
+MAX_WORD_LENGTH = 20
+MAX_CARRY_LENGTH = 4 * CHUNK_SIZE
+WHITESPACE = (" ", "\n", "\t", "\r")
+INGEST_MODES = ("count", "unique", "quote")
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    with open(path, encoding="utf-8", errors="replace") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def tokenize(chunks, pattern=WORD_PATTERN):
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        boundary = get_last_whitespace(text)
+        if boundary < 0 and len(text) <= MAX_CARRY_LENGTH:
+            carry = text
+            continue
+        if boundary < 0:
+            boundary = len(text)
+        carry = text[boundary:]
+        yield from pattern.findall(text, 0, boundary)
+    if carry:
+        yield from pattern.findall(carry)
+
+
+def get_last_whitespace(text: str):
+    return max(text.rfind(separator) for separator in WHITESPACE)
+
+
+def normalize(tokens, lowercase=True, min_length=1, max_length=MAX_WORD_LENGTH):
+    for token in tokens:
+        token = unicodedata.normalize("NFKC", token).translate(APOSTROPHES)
+        if lowercase:
+            token = token.lower()
+        if min_length <= len(token) <= max_length:
+            yield token
+
+
+def count_words(words, max_vocabulary=None):
+    counts = Counter()
+    for word in words:
+        counts[word] += 1
+        if max_vocabulary is not None and len(counts) > 2 * max_vocabulary:
+            counts = Counter(dict(counts.most_common(max_vocabulary)))
+    if max_vocabulary is not None:
+        return counts.most_common(max_vocabulary)
+    return counts.most_common()
+
+
+def unique_words(words):
+    seen = set()
+    for word in words:
+        if word not in seen:
+            seen.add(word)
+            yield word
+
+
+def iter_tokens(paths, pattern=WORD_PATTERN, chunk_size=CHUNK_SIZE):
+    for path in paths:
+        yield from tokenize(read_chunks(path, chunk_size), pattern)
+
+
+def write_words(output_path, words, counted=False):
+    with CorpusWriter(output_path) as writer:
+        if counted:
+            for word, count in words:
+                writer.add_word(word, count)
+        else:
+            for word in words:
+                writer.add_word(word)
+    return len(writer)
+
+
+def ingest(paths, output_path, mode="count", lowercase=None, min_length=1, max_length=MAX_WORD_LENGTH,
+           max_vocabulary=None, chunk_size=CHUNK_SIZE):
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode: {mode}")
+    if mode == "quote":
+        tokens = iter_tokens(paths, QUOTE_PATTERN, chunk_size)
+        words = normalize(tokens, lowercase is True, min_length, max_length)
+        return write_words(output_path, words)
+    tokens = iter_tokens(paths, WORD_PATTERN, chunk_size)
+    words = normalize(tokens, lowercase is not False, min_length, max_length)
+    if mode == "unique":
+        return write_words(output_path, unique_words(words))
+    return write_words(output_path, count_words(words, max_vocabulary), counted=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a word list for the typing test from text files")
+    parser.add_argument("inputs", nargs="+", help="text files to read")
+    parser.add_argument("--output", required=True, help="word list to write, loadable by WordGenerator")
+    parser.add_argument("--mode", choices=INGEST_MODES, default="count",
+                        help="count: words with frequencies; unique: each word once; quote: words in text order")
+    parser.add_argument("--keep-case", action="store_true", help="don't lowercase words")
+    parser.add_argument("--min-length", type=int, default=1)
+    parser.add_argument("--max-length", type=int, default=MAX_WORD_LENGTH)
+    parser.add_argument("--max-vocabulary", type=int, help="keep only the most frequent words in count mode")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    arguments = parser.parse_args()
+    lowercase = False if arguments.keep_case else None
+    count = ingest(arguments.inputs, arguments.output, arguments.mode, lowercase, arguments.min_length,
+                   arguments.max_length, arguments.max_vocabulary, arguments.chunk_size)
+    print(f"Wrote {count} entries to {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
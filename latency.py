@@ -0,0 +1,105 @@
+import json
+import os
+import time
+from array import array
+from time import perf_counter_ns
+from settings import LATENCY_TRACKING
+
+STAGES = ("dispatch", "session", "recolor", "paint")
+RING_CAPACITY = 8192
+SUB_BUCKET_BITS = 4
+PERCENTILES = (50, 95, 99)
+
+
+def _noop(*args):
+    pass
+
+
+class LatencyRing:
+    def __init__(self, capacity=RING_CAPACITY):
+        self.samples = array("q", bytes(8 * capacity))
+        self.capacity = capacity
+        self.position = 0
+        self.count = 0
+
+    def add(self, value):
+        self.samples[self.position] = value
+        self.position = (self.position + 1) % self.capacity
+        self.count += 1
+
+    def get_samples(self):
+        if self.count < self.capacity:
+            return self.samples[:self.count]
+        return self.samples
+
+
+class LatencyProbe:
+    def __init__(self, stages=STAGES, capacity=RING_CAPACITY, enabled=False):
+        self.stages = stages
+        self.capacity = capacity
+        self.rings = {}
+        self.start_ns = 0
+        self.last_ns = 0
+        self.clear()
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.start = self._start if enabled else _noop
+        self.mark = self._mark if enabled else _noop
+
+    def clear(self):
+        self.rings = {stage: LatencyRing(self.capacity) for stage in (*self.stages, "total")}
+
+    def _start(self):
+        self.start_ns = self.last_ns = perf_counter_ns()
+
+    def _mark(self, stage):
+        now = perf_counter_ns()
+        self.rings[stage].add(now - self.last_ns)
+        self.last_ns = now
+        if stage == self.stages[-1]:
+            self.rings["total"].add(now - self.start_ns)
+
+    def get_percentiles(self, stage, percentiles=PERCENTILES):
+        samples = sorted(self.rings[stage].get_samples())
+        if not samples:
+            return {f"p{percentile}": None for percentile in percentiles}
+        return {f"p{percentile}": samples[min(len(samples) - 1, len(samples) * percentile // 100)]
+                for percentile in percentiles}
+
+    def get_summary(self):
+        return {stage: self.get_percentiles(stage) for stage in self.rings}
+
+    def get_histogram(self, stage):
+        buckets = {}
+        for value in self.rings[stage].get_samples():
+            bucket = get_bucket_index(value)
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        return [(*get_bucket_bounds(bucket), count) for bucket, count in sorted(buckets.items())]
+
+    def dump(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        report = {stage: {"count": self.rings[stage].count,
+                          "percentiles_ns": self.get_percentiles(stage),
+                          "histogram_ns": self.get_histogram(stage)}
+                  for stage in self.rings}
+        path = os.path.join(folder, time.strftime("latency-%Y%m%d-%H%M%S.json"))
+        with open(path, "w") as file:
+            json.dump(report, file, indent=1)
+        return path
+
+
+def get_bucket_index(value):
+    value = max(0, value)
+    magnitude = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+    return (magnitude << SUB_BUCKET_BITS) + (value >> magnitude)
+
+
+def get_bucket_bounds(bucket):
+    magnitude = max(0, (bucket >> SUB_BUCKET_BITS) - 1)
+    mantissa = bucket - (magnitude << SUB_BUCKET_BITS)
+    return mantissa << magnitude, (mantissa + 1) << magnitude
+
+
+latency_probe = LatencyProbe(enabled=LATENCY_TRACKING)
@@ -0,0 +1,171 @@
+import argparse
+import math
+import os
+import random
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from settings import TIMER_LENGTH
+from stats import Statistics
+from typingsession import TypingSession
+from wordgenerator import WordGenerator
+
+CHARS_PER_WORD = 5
+TIMING_DISTRIBUTIONS = ("normal", "lognormal", "exponential")
+
+
+class TypistProfile:
+    def __init__(self, wpm=60.0, error_rate=0.05, backspace_rate=0.02, timing="lognormal", jitter=0.3):
+        if timing not in TIMING_DISTRIBUTIONS:
+            raise ValueError(f"Unknown timing distribution: {timing}")
+        self.wpm = wpm
+        self.error_rate = error_rate
+        self.backspace_rate = backspace_rate
+        self.timing = timing
+        self.jitter = jitter
+
+    def get_mean_key_delay(self):
+        return 60 / (self.wpm * CHARS_PER_WORD)
+
+    def draw_key_delay(self, random_generator: random.Random):
+        mean = self.get_mean_key_delay()
+        if self.timing == "normal":
+            return max(0.001, random_generator.gauss(mean, mean * self.jitter))
+        if self.timing == "exponential":
+            return random_generator.expovariate(1 / mean)
+        sigma = math.sqrt(math.log(1 + self.jitter ** 2))
+        return random_generator.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+
+
+class SyntheticTypist:
+    def __init__(self, profile: TypistProfile, seed=None, duration=TIMER_LENGTH):
+        self.profile = profile
+        self.random = random.Random(seed)
+        self.duration = duration
+        self.session = TypingSession.from_generator(WordGenerator(seed=seed), Statistics())
+        self.clock = 0.0
+        self.keystrokes = 0
+        self.expected_words = 0
+
+    def press_key(self):
+        self.clock += self.profile.draw_key_delay(self.random)
+        self.keystrokes += 1
+
+    def type_text(self, text):
+        for i in range(1, len(text) + 1):
+            self.press_key()
+            self.session.check_word(text[:i])
+
+    def get_typed_word(self, word):
+        letters = list(word)
+        for i, letter in enumerate(letters):
+            if self.random.random() < self.profile.error_rate:
+                letters[i] = self.random.choice(string.ascii_lowercase.replace(letter, ""))
+        return "".join(letters)
+
+    def submit(self, text):
+        self.press_key()
+        self.session.move_to_next_word(text, self.clock)
+        self.expected_words += 1
+
+    def correct_last_word(self, typed_word, word):
+        self.press_key()
+        self.press_key()
+        self.session.move_to_previous_word()
+        self.expected_words -= 1
+        self.session.check_word(typed_word)
+        for i in range(len(typed_word) - 1, -1, -1):
+            self.press_key()
+            self.session.check_word(typed_word[:i])
+        self.type_text(word)
+        self.submit(word)
+
+    def run(self):
+        while self.clock < self.duration:
+            word = self.session.get_current_word().word
+            typed_word = self.get_typed_word(word)
+            self.type_text(typed_word)
+            self.submit(typed_word)
+            if self.random.random() < self.profile.backspace_rate:
+                self.correct_last_word(typed_word, word)
+        return self
+
+    def check_invariants(self):
+        statistics = self.session.statistics
+        violations = []
+        words = statistics.get_word_count()
+        correct_words = statistics.get_correct_words_count()
+        chars = statistics.get_char_count()
+        correct_chars = statistics.get_correct_char_count()
+        if words != self.expected_words:
+            violations.append(f"word count {words} != submitted words {self.expected_words}")
+        if not 0 <= correct_words <= words:
+            violations.append(f"correct words {correct_words} outside 0..{words}")
+        if not correct_words <= correct_chars <= chars:
+            violations.append(f"correct chars {correct_chars} outside {correct_words}..{chars}")
+        if correct_words == words and correct_chars != chars:
+            violations.append(f"all words correct but correct chars {correct_chars} != chars {chars}")
+        try:
+            statistics.check_counters()
+        except ValueError as error:
+            violations.append(str(error))
+        return violations
+
+
+def run_batch(profile: TypistProfile, sessions, seed):
+    keystrokes = 0
+    violations = []
+    for i in range(sessions):
+        typist = SyntheticTypist(profile, seed=seed * 1000003 + i).run()
+        keystrokes += typist.keystrokes
+        violations += typist.check_invariants()
+    return sessions, keystrokes, violations
+
+
+def run_load(profile: TypistProfile, sessions, workers=None, batch_size=50, seed=0):
+    workers = workers or os.cpu_count() or 1
+    batches = [min(batch_size, sessions - start) for start in range(0, sessions, batch_size)]
+    start_time = time.perf_counter()
+    total_sessions = total_keystrokes = 0
+    violations = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_batch, profile, size, seed + i) for i, size in enumerate(batches)]
+        for future in futures:
+            done_sessions, keystrokes, batch_violations = future.result()
+            total_sessions += done_sessions
+            total_keystrokes += keystrokes
+            violations += batch_violations
+    elapsed = time.perf_counter() - start_time
+    return {"sessions": total_sessions,
+            "keystrokes": total_keystrokes,
+            "seconds": elapsed,
+            "sessions_per_second": total_sessions / elapsed,
+            "keystrokes_per_second": total_keystrokes / elapsed,
+            "violations": violations}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run synthetic typists against the typing session logic")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--wpm", type=float, default=60.0)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--backspace-rate", type=float, default=0.02)
+    parser.add_argument("--timing", choices=TIMING_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+    profile = TypistProfile(arguments.wpm, arguments.error_rate, arguments.backspace_rate,
+                            arguments.timing, arguments.jitter)
+    result = run_load(profile, arguments.sessions, arguments.workers, seed=arguments.seed)
+    print(f"Sessions: {result['sessions']} in {result['seconds']:.2f}s "
+          f"({result['sessions_per_second']:.0f} sessions/s, {result['keystrokes_per_second']:.0f} keystrokes/s)")
+    print(f"Invariant violations: {len(result['violations'])}")
+    for violation in result["violations"][:20]:
+        print(f"  {violation}")
+    if result["violations"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
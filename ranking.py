@@ -0,0 +1,170 @@
+import json
+import os
+from fenwick import FenwickTree
+from stats import Statistics
+
+RANKING_VERSION = 1
+METRIC_LAYOUTS = {"cpm": (0.0, 2000.0, 1.0),
+                  "wpm": (0.0, 400.0, 1.0),
+                  "accuracy": (0.0, 100.0, 0.1)}
+
+
+class ScoreHistogram:
+    def __init__(self, low, high, bucket_width):
+        if high <= low or bucket_width <= 0:
+            raise ValueError(f"Invalid histogram layout: {low}..{high} by {bucket_width}")
+        self.low = low
+        self.high = high
+        self.bucket_width = bucket_width
+        self.bucket_count = round((high - low) / bucket_width) + 1
+        self.counts = FenwickTree([0.0] * self.bucket_count)
+
+    def get_layout(self):
+        return self.low, self.high, self.bucket_width
+
+    def get_bucket(self, value):
+        index = round((value - self.low) / self.bucket_width)
+        return min(max(index, 0), self.bucket_count - 1)
+
+    def get_bucket_value(self, index):
+        return self.low + index * self.bucket_width
+
+    def add(self, value, count=1):
+        self.counts.add(self.get_bucket(value), count)
+
+    def get_count(self):
+        return round(self.counts.get_total())
+
+    def get_rank(self, value):
+        total = self.counts.get_total()
+        if not total:
+            return None
+        return self.counts.prefix_sum(self.get_bucket(value)) / total
+
+    def get_quantile(self, fraction):
+        total = self.counts.get_total()
+        if not total:
+            return None
+        target = min(max(fraction, 0.0), 1.0) * total
+        return self.get_bucket_value(self.counts.find(min(target, total - 0.5)))
+
+    def merge(self, other: "ScoreHistogram"):
+        if other.get_layout() != self.get_layout():
+            raise ValueError(f"Can't merge histogram {other.get_layout()} into {self.get_layout()}")
+        for index in range(other.bucket_count):
+            count = other.counts.get(index)
+            if count:
+                self.counts.add(index, count)
+
+    def export(self):
+        return {"layout": list(self.get_layout()),
+                "counts": {str(index): self.counts.get(index)
+                           for index in range(self.bucket_count) if self.counts.get(index)}}
+
+    @classmethod
+    def from_export(cls, data: dict):
+        histogram = cls(*data["layout"])
+        for index, count in data["counts"].items():
+            histogram.counts.add(int(index), count)
+        return histogram
+
+
+class RankingIndex:
+    def __init__(self, histograms: dict[str, ScoreHistogram] | None = None):
+        if histograms is None:
+            histograms = {metric: ScoreHistogram(*layout) for metric, layout in METRIC_LAYOUTS.items()}
+        self.histograms = histograms
+
+    @staticmethod
+    def get_scores(statistics: Statistics, duration):
+        return {"cpm": statistics.get_chars_per_minute(duration),
+                "wpm": statistics.get_words_per_minute(duration),
+                "accuracy": statistics.get_accuracy()}
+
+    def add_scores(self, scores: dict):
+        for metric, value in scores.items():
+            self.histograms[metric].add(value)
+
+    def get_ranks(self, scores: dict):
+        return {metric: self.histograms[metric].get_rank(value) for metric, value in scores.items()}
+
+    def get_count(self):
+        return self.histograms["cpm"].get_count()
+
+    def merge(self, other: "RankingIndex"):
+        for metric, histogram in other.histograms.items():
+            self.histograms[metric].merge(histogram)
+
+    def export(self):
+        return {metric: histogram.export() for metric, histogram in self.histograms.items()}
+
+    @classmethod
+    def from_export(cls, data: dict):
+        return cls({metric: ScoreHistogram.from_export(histogram) for metric, histogram in data.items()})
+
+
+class RankingStore:
+    def __init__(self, everyone: RankingIndex | None = None, users: dict[str, RankingIndex] | None = None):
+        self.everyone = everyone if everyone is not None else RankingIndex()
+        self.users = users if users is not None else {}
+
+    @classmethod
+    def from_history(cls, user, sessions):
+        store = cls()
+        for cpm, wpm, char_count, error_char_count in sessions:
+            accuracy = (char_count - error_char_count) * 100 / char_count if char_count else 0.0
+            store.add_scores(user, {"cpm": cpm, "wpm": wpm, "accuracy": accuracy})
+        return store
+
+    def get_user_index(self, user):
+        index = self.users.get(user)
+        if index is None:
+            index = RankingIndex()
+            self.users[user] = index
+        return index
+
+    def add_scores(self, user, scores: dict):
+        self.everyone.add_scores(scores)
+        self.get_user_index(user).add_scores(scores)
+
+    def get_ranks(self, user, scores: dict):
+        user_index = self.users.get(user)
+        return {"everyone": self.everyone.get_ranks(scores),
+                "user": user_index.get_ranks(scores) if user_index is not None else None}
+
+    def merge(self, other: "RankingStore"):
+        self.everyone.merge(other.everyone)
+        for user, index in other.users.items():
+            self.get_user_index(user).merge(index)
+
+    def export(self):
+        return {"version": RANKING_VERSION,
+                "everyone": self.everyone.export(),
+                "users": {user: index.export() for user, index in self.users.items()}}
+
+    @classmethod
+    def from_export(cls, data: dict):
+        if data.get("version") != RANKING_VERSION:
+            raise ValueError(f"Unsupported ranking version: {data.get('version')}")
+        return cls(RankingIndex.from_export(data["everyone"]),
+                   {user: RankingIndex.from_export(index) for user, index in data["users"].items()})
+
+    def save(self, path):
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self.export(), file, separators=(",", ":"))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as file:
+            return cls.from_export(json.load(file))
+
+    @classmethod
+    def load_all(cls, paths):
+        store = cls()
+        for path in paths:
+            store.merge(cls.load(path))
+        return store
@@ -0,0 +1,227 @@
+import mmap
+import os
+import struct
+import time
+from collections import deque
+from eventbus import EventBus, SessionStarted, RowAdded, TextUpdated, WordSubmitted, FieldCleared, SessionFinished
+from typing import Callable
+from settings import ROWS_OF_WORDS, WORDS_IN_ROW
+from stats import Statistics
+from typingsession import TypingSession, get_common_prefix_length
+from wordgenerator import WordGenerator
+
+LOG_HEADER = b"TSLG\x01"
+LOG_EXTENSION = ".tslog"
+BUFFER_SIZE = 64 * 1024
+
+ROW_ADDED = 0
+TEXT_UPDATED = 1
+WORD_SUBMITTED = 2
+FIELD_CLEARED = 3
+
+EVENT = struct.Struct("<IB")
+LENGTH = struct.Struct("<H")
+TEXT_DIFF = struct.Struct("<HH")
+MAX_DELTA = 0xFFFFFFFF
+
+
+class SessionRecorder:
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self.path = path
+        self.file = open(path, "wb", buffering=buffer_size)
+        self.file.write(LOG_HEADER)
+        self.last_time = time.monotonic()
+        self.last_text = ""
+
+    @classmethod
+    def create(cls, folder):
+        os.makedirs(folder, exist_ok=True)
+        file_name = time.strftime("%Y%m%d-%H%M%S") + f"-{time.monotonic_ns() % 1000000:06d}{LOG_EXTENSION}"
+        return cls(os.path.join(folder, file_name))
+
+    def write_event(self, kind, payload=b"", timestamp=None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        delta = min(max(0, round((timestamp - self.last_time) * 1000000)), MAX_DELTA)
+        self.file.write(EVENT.pack(delta, kind) + payload)
+        self.last_time = timestamp
+
+    def record_row(self, words: list[str], timestamp=None):
+        payload = bytes([len(words)]) + b"".join(self.pack_text(word) for word in words)
+        self.write_event(ROW_ADDED, payload, timestamp)
+
+    def record_text(self, current_input: str, timestamp=None):
+        common = get_common_prefix_length(self.last_text, current_input)
+        suffix = current_input[common:].encode()
+        self.write_event(TEXT_UPDATED, TEXT_DIFF.pack(common, len(suffix)) + suffix, timestamp)
+        self.last_text = current_input
+
+    def record_submit(self, current_input: str, timestamp=None):
+        self.write_event(WORD_SUBMITTED, self.pack_text(current_input), timestamp)
+
+    def record_clear(self, timestamp=None):
+        self.write_event(FIELD_CLEARED, timestamp=timestamp)
+
+    @staticmethod
+    def pack_text(text: str):
+        encoded = text.encode()
+        return LENGTH.pack(len(encoded)) + encoded
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class RecordingSubscriber:
+    def __init__(self, folder):
+        self.folder = folder
+        self.recorder = None
+
+    def subscribe(self, event_bus: EventBus):
+        event_bus.subscribe(SessionStarted, self.start, inline=False, name="recorder")
+        event_bus.subscribe(RowAdded, self.record_row, inline=False, name="recorder")
+        event_bus.subscribe(TextUpdated, self.record_text, inline=False, name="recorder")
+        event_bus.subscribe(WordSubmitted, self.record_submit, inline=False, name="recorder")
+        event_bus.subscribe(FieldCleared, self.record_clear, inline=False, name="recorder")
+        event_bus.subscribe(SessionFinished, self.finish, inline=False, name="recorder")
+
+    def start(self, event: SessionStarted):
+        self.finish(None)
+        self.recorder = SessionRecorder.create(self.folder)
+        self.recorder.last_time = event.timestamp
+
+    def record_row(self, event: RowAdded):
+        if self.recorder is not None:
+            self.recorder.record_row(event.words, event.timestamp)
+
+    def record_text(self, event: TextUpdated):
+        if self.recorder is not None:
+            self.recorder.record_text(event.text, event.timestamp)
+
+    def record_submit(self, event: WordSubmitted):
+        if self.recorder is not None:
+            self.recorder.record_submit(event.text, event.timestamp)
+
+    def record_clear(self, event: FieldCleared):
+        if self.recorder is not None:
+            self.recorder.record_clear(event.timestamp)
+
+    def finish(self, event: SessionFinished | None):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+
+class RecordingWordSource:
+    def __init__(self, word_generator: WordGenerator, event_bus: EventBus):
+        self.word_generator = word_generator
+        self.event_bus = event_bus
+
+    def get_word_list(self, number_of_words):
+        words = self.word_generator.get_word_list(number_of_words)
+        self.event_bus.publish(RowAdded(words))
+        return words
+
+    def get_word_matrix(self, rows, columns):
+        return [self.get_word_list(columns) for _ in range(rows)]
+
+    def record_result(self, word: str, is_correct: bool):
+        self.word_generator.record_result(word, is_correct)
+
+
+class ReplayWordSource:
+    def __init__(self):
+        self.rows = deque()
+
+    def add_row(self, words: list[str]):
+        self.rows.append(words)
+
+    def get_word_list(self, number_of_words):
+        if not self.rows:
+            raise ValueError("Recording has no more rows to replay")
+        words = self.rows.popleft()
+        if len(words) != number_of_words:
+            raise ValueError(f"Unexpected number of words in recorded row! Expected: {number_of_words}; "
+                             f"received: {len(words)}")
+        return words
+
+    def get_word_matrix(self, rows, columns):
+        return [self.get_word_list(columns) for _ in range(rows)]
+
+    def record_result(self, word: str, is_correct: bool):
+        pass
+
+
+def read_events(buffer):
+    if buffer[:len(LOG_HEADER)] != LOG_HEADER:
+        raise ValueError("Not a typing session log")
+    offset = len(LOG_HEADER)
+    timestamp = 0.0
+    last_text = ""
+    end = len(buffer)
+    while offset < end:
+        delta, kind = EVENT.unpack_from(buffer, offset)
+        offset += EVENT.size
+        timestamp += delta / 1000000
+        if kind == ROW_ADDED:
+            count = buffer[offset]
+            offset += 1
+            words = []
+            for _ in range(count):
+                word, offset = read_text(buffer, offset)
+                words.append(word)
+            yield timestamp, kind, words
+        elif kind == TEXT_UPDATED:
+            common, length = TEXT_DIFF.unpack_from(buffer, offset)
+            offset += TEXT_DIFF.size
+            last_text = last_text[:common] + bytes(buffer[offset:offset + length]).decode()
+            offset += length
+            yield timestamp, kind, last_text
+        elif kind == WORD_SUBMITTED:
+            text, offset = read_text(buffer, offset)
+            yield timestamp, kind, text
+        elif kind == FIELD_CLEARED:
+            yield timestamp, kind, None
+        else:
+            raise ValueError(f"Unknown event kind {kind} at offset {offset - EVENT.size}")
+
+
+def read_text(buffer, offset):
+    (length,) = LENGTH.unpack_from(buffer, offset)
+    offset += LENGTH.size
+    return bytes(buffer[offset:offset + length]).decode(), offset + length
+
+
+def replay(path, statistics: Statistics | None = None):
+    if statistics is None:
+        statistics = Statistics()
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        replay_events(read_events(buffer), statistics)
+    return statistics
+
+
+def replay_events(events, statistics: Statistics, observer: Callable | None = None):
+    word_source = ReplayWordSource()
+    session = None
+    for timestamp, kind, value in events:
+        if observer is not None and session is not None:
+            observer(session, timestamp, kind, value)
+        if kind == ROW_ADDED:
+            word_source.add_row(value)
+            if session is None and len(word_source.rows) == ROWS_OF_WORDS:
+                starting_words = word_source.get_word_matrix(ROWS_OF_WORDS, WORDS_IN_ROW)
+                session = TypingSession(starting_words, statistics, word_source)
+        elif session is None:
+            raise ValueError("Recording has input events before its starting rows")
+        elif kind == TEXT_UPDATED:
+            session.check_word(value)
+        elif kind == WORD_SUBMITTED:
+            session.move_to_next_word(value, timestamp)
+        elif kind == FIELD_CLEARED:
+            session.move_to_previous_word()
+    return session
+
+
+def replay_folder(folder):
+    paths = sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(LOG_EXTENSION))
+    return {path: replay(path) for path in paths}
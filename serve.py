@@ -0,0 +1,12 @@
+import argparse
+import asyncio
+from server import TypingServer, DEFAULT_HOST, DEFAULT_PORT
+
+parser = argparse.ArgumentParser(description="Run the typing test server")
+parser.add_argument("--host", default=DEFAULT_HOST)
+parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+parser.add_argument("--unix", help="listen on a Unix socket at this path instead of TCP")
+parser.add_argument("--seed", type=int, help="seed for the shared word rows of every room")
+arguments = parser.parse_args()
+
+asyncio.run(TypingServer(room_seed=arguments.seed).serve_forever(arguments.host, arguments.port, arguments.unix))
@@ -0,0 +1,238 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from settings import ROWS_OF_WORDS, WORDS_IN_ROW, WORDS_FILE
+from stats import Statistics
+from typingsession import TypingSession
+from wordgenerator import WordGenerator
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_ROOM = "lobby"
+MAX_LINE_LENGTH = 64 * 1024
+MAX_ROOM_NAME_LENGTH = 64
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class Room:
+    def __init__(self, name, seed=None, words_file=WORDS_FILE):
+        self.name = name
+        self.word_generator = WordGenerator(words_file, seed=seed)
+        self.rows: deque[list[str]] = deque()
+        self.first_row = 0
+        self.sources: set[RoomWordSource] = set()
+
+    def get_row(self, index):
+        if index < self.first_row:
+            raise IndexError(f"Row was already dropped from the room: {index}")
+        while self.first_row + len(self.rows) <= index:
+            self.rows.append(self.word_generator.get_word_list(WORDS_IN_ROW))
+        row = self.rows[index - self.first_row]
+        if len(self.rows) > 2 * ROWS_OF_WORDS:
+            self.drop_unused_rows()
+        return row
+
+    def drop_unused_rows(self):
+        needed_row = min((source.row_index for source in self.sources), default=self.first_row + len(self.rows))
+        while self.first_row < needed_row and self.rows:
+            self.rows.popleft()
+            self.first_row += 1
+
+    def add_source(self, source: "RoomWordSource"):
+        self.sources.add(source)
+
+    def remove_source(self, source: "RoomWordSource"):
+        self.sources.discard(source)
+
+    def is_empty(self):
+        return not self.sources
+
+
+class RoomWordSource:
+    def __init__(self, room: Room):
+        self.room = room
+        self.row_index = room.first_row
+        room.add_source(self)
+
+    def get_word_list(self, number_of_words):
+        words = self.room.get_row(self.row_index)
+        self.row_index += 1
+        return words
+
+    def get_word_matrix(self, rows, columns):
+        return [self.get_word_list(columns) for _ in range(rows)]
+
+    def record_result(self, word: str, is_correct: bool):
+        pass
+
+
+class ClientSession:
+    def __init__(self, session_id, room: Room):
+        self.session_id = session_id
+        self.room = room
+        self.word_source = RoomWordSource(room)
+        try:
+            starting_words = self.word_source.get_word_matrix(ROWS_OF_WORDS, WORDS_IN_ROW)
+        except Exception:
+            self.leave()
+            raise
+        self.session = TypingSession(starting_words, Statistics(), self.word_source)
+        self.start_time = None
+
+    def leave(self):
+        self.room.remove_source(self.word_source)
+
+    def get_elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        return time.monotonic() - self.start_time
+
+    def type_text(self, text):
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        self.session.check_word(text)
+        return {"letters": list(self.session.get_current_word().letter_states)}
+
+    def submit(self, text):
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        row_count = len(self.session.rows)
+        self.session.move_to_next_word(text)
+        new_rows = [[word.word for word in row] for row in self.session.rows[row_count:]]
+        return {"position": self.session.get_position(), "new_rows": new_rows}
+
+    def back(self):
+        self.session.move_to_previous_word()
+        return {"position": self.session.get_position()}
+
+    def get_stats(self):
+        statistics = self.session.statistics
+        elapsed = self.get_elapsed()
+        return {"elapsed": elapsed,
+                "words": statistics.get_word_count(),
+                "correct_words": statistics.get_correct_words_count(),
+                "chars": statistics.get_char_count(),
+                "correct_chars": statistics.get_correct_char_count(),
+                "error_chars": statistics.get_error_char_count(),
+                "cpm": statistics.get_chars_per_minute(elapsed),
+                "wpm": statistics.get_words_per_minute(elapsed)}
+
+
+class TypingServer:
+    def __init__(self, room_seed=None):
+        self.room_seed = room_seed
+        self.rooms: dict[str, Room] = {}
+        self.session_ids = itertools.count(1)
+        self.client_count = 0
+        self.server = None
+
+    def get_room(self, name):
+        room = self.rooms.get(name)
+        if room is None:
+            room = Room(name, self.room_seed)
+            self.rooms[name] = room
+        return room
+
+    def leave_room(self, client: ClientSession | None):
+        if client is None:
+            return
+        client.leave()
+        self.evict_room(client.room)
+
+    def evict_room(self, room: Room):
+        if room.is_empty() and self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, path=unix_path, limit=MAX_LINE_LENGTH)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE_LENGTH)
+        return self.server
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        server = await self.start(host, port, unix_path)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.client_count += 1
+        client = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self.send(writer, {"ok": False, "error": "Line too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("Request must be a JSON object")
+                    client, response = self.handle_request(client, request)
+                    response["ok"] = True
+                except (ProtocolError, ValueError, IndexError) as error:
+                    response = {"ok": False, "error": str(error)}
+                await self.send(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            self.leave_room(client)
+            self.client_count -= 1
+            writer.close()
+
+    def handle_request(self, client: ClientSession | None, request: dict):
+        operation = request.get("op")
+        if operation == "start":
+            room = self.get_room(self.get_room_name(request))
+            try:
+                new_client = ClientSession(next(self.session_ids), room)
+            except Exception:
+                self.evict_room(room)
+                raise
+            self.leave_room(client)
+            client = new_client
+            rows = [[word.word for word in row] for row in client.session.rows]
+            return client, {"session": client.session_id, "room": room.name, "rows": rows}
+        if client is None:
+            raise ProtocolError("Send a start request first")
+        if operation == "text":
+            return client, client.type_text(self.get_text(request))
+        if operation == "submit":
+            return client, client.submit(self.get_text(request))
+        if operation == "back":
+            return client, client.back()
+        if operation == "stats":
+            return client, client.get_stats()
+        raise ProtocolError(f"Unknown operation: {operation}")
+
+    @staticmethod
+    def get_room_name(request: dict):
+        name = str(request.get("room", DEFAULT_ROOM))
+        if len(name) > MAX_ROOM_NAME_LENGTH:
+            raise ProtocolError(f"Room name is longer than {MAX_ROOM_NAME_LENGTH} characters")
+        return name
+
+    @staticmethod
+    def get_text(request: dict):
+        text = request.get("text")
+        if not isinstance(text, str):
+            raise ProtocolError("Request needs a text string")
+        return text
+
+    @staticmethod
+    async def send(writer: asyncio.StreamWriter, response: dict):
+        writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+        await writer.drain()
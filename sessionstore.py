@@ -0,0 +1,107 @@
+import bisect
+import time
+from array import array
+
+
+class WordStat:
+    __slots__ = ("word", "is_correct", "correct_characters", "timestamp")
+
+    def __init__(self, word: str, is_correct: bool, correct_characters: int, timestamp: float = 0.0):
+        self.word = word
+        self.is_correct = is_correct
+        self.correct_characters = correct_characters
+        self.timestamp = timestamp
+
+
+class SessionStore:
+    def __init__(self):
+        self.strings: list[str] = []
+        self.string_ids: dict[str, int] = {}
+        self.word_ids = array("I")
+        self.correct_flags = array("B")
+        self.correct_chars = array("H")
+        self.timestamps = array("d")
+        self.typed_ids = array("I")
+
+    def intern(self, text: str):
+        string_id = self.string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.string_ids[text] = string_id
+            self.strings.append(text)
+        return string_id
+
+    def add_word(self, word: str, is_correct: bool, correct_characters: int, timestamp: float | None = None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self.word_ids.append(self.intern(word))
+        self.correct_flags.append(is_correct)
+        self.correct_chars.append(correct_characters)
+        self.timestamps.append(timestamp)
+
+    def pop_word(self):
+        self.check_word_exist(-1)
+        word_stat = self.get_word_stat(-1)
+        self.word_ids.pop()
+        self.correct_flags.pop()
+        self.correct_chars.pop()
+        self.timestamps.pop()
+        return word_stat
+
+    def get_word_stat(self, index):
+        self.check_word_exist(index)
+        return WordStat(self.strings[self.word_ids[index]],
+                        bool(self.correct_flags[index]),
+                        self.correct_chars[index],
+                        self.timestamps[index])
+
+    def find_first_after(self, timestamp: float):
+        return bisect.bisect_right(self.timestamps, timestamp)
+
+    def get_word(self, index):
+        self.check_word_exist(index)
+        return self.strings[self.word_ids[index]]
+
+    def check_word_exist(self, index):
+        if not -len(self.word_ids) <= index < len(self.word_ids):
+            raise IndexError(f"Word doesn't exist at index: {index}")
+
+    def get_word_count(self):
+        return len(self.word_ids)
+
+    def push_typed(self, text: str):
+        self.typed_ids.append(self.intern(text))
+
+    def pop_typed(self):
+        if not self.typed_ids:
+            raise IndexError("No typed words to pop")
+        return self.strings[self.typed_ids.pop()]
+
+    def get_last_typed(self):
+        if not self.typed_ids:
+            return None
+        return self.strings[self.typed_ids[-1]]
+
+    def get_typed_count(self):
+        return len(self.typed_ids)
+
+    def clear_words(self):
+        self.word_ids = array("I")
+        self.correct_flags = array("B")
+        self.correct_chars = array("H")
+        self.timestamps = array("d")
+        self.reset_strings_if_unused()
+
+    def clear_typed(self):
+        self.typed_ids = array("I")
+        self.reset_strings_if_unused()
+
+    def reset_strings_if_unused(self):
+        if self.word_ids or self.typed_ids:
+            return
+        self.strings = []
+        self.string_ids = {}
+
+    def get_byte_size(self):
+        columns = [self.word_ids, self.correct_flags, self.correct_chars, self.timestamps, self.typed_ids]
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns)
@@ -17,3 +17,39 @@ TITLE = "Typing Speed Tester"
 WORDS_IN_ROW = 6
 ROWS_OF_WORDS = 3
 TIMER_LENGTH = 60
+# Seconds between timer ticks; the countdown label still changes once per second
+TIMER_TICK_LENGTH = 0.25
+# Seed for the word sampler; None draws different words every run
+WORD_SEED = None
+# Oversample words and letter pairs the user mistypes. Rows already drawn keep their words, so with the "labels"
+# renderer a boost first shows two rows later: the visible next row and the prerendered one are already drawn
+ADAPTIVE_WORDS = False
+# Word list to load; build one from your own texts with ingest.py
+WORDS_FILE = "assets/words.txt"
+# Fill the matrix with the word list in order instead of random words, e.g. a list from ingest.py --mode quote
+QUOTE_MODE = False
+# "labels" draws one tk.Label per letter, "text" draws the matrix into one tagged tk.Text
+MATRIX_RENDERER = "labels"
+# Chart
+SHOW_CHART = True
+# Seconds of typing the rolling WPM and accuracy are computed over
+CHART_WINDOW = 10
+# Most points drawn per line; older samples are merged into min/max buckets
+CHART_MAX_POINTS = 240
+# Recording
+RECORD_SESSIONS = False
+RECORDINGS_FOLDER = "recordings"
+# Events
+# Events waiting for background subscribers such as the recorder
+EVENT_QUEUE_SIZE = 1024
+# What a full queue does with text updates: "block", "drop" or "coalesce"; other events always wait
+EVENT_BACKPRESSURE = "coalesce"
+# Latency
+LATENCY_TRACKING = False
+LATENCY_FOLDER = "latency"
+# History
+HISTORY_FILE = "history.sqlite3"
+# Ranking
+RANKING_FILE = "ranking.json"
+# Name the ranking index files the results under, so indexes from several machines can be merged per user
+USER_NAME = "local"
@@ -1,52 +1,106 @@
-class WordStat:
-    def __init__(self, word: str, is_correct: bool, correct_characters: int):
-        self.word = word
-        self.is_correct = is_correct
-        self.correct_characters = correct_characters
+from sessionstore import SessionStore, WordStat
 
 
 class Statistics:
-    def __init__(self):
-        self.word_stats: list[WordStat] = []
+    def __init__(self, store: SessionStore | None = None):
+        self.store = store if store is not None else SessionStore()
+        self.reset_counters()
 
-    def add_words(self, word: str, is_correct: bool, correct_characters: int):
-        new_word_stat = WordStat(word, is_correct, correct_characters)
-        self.word_stats.append(new_word_stat)
+    def reset_counters(self):
+        self.word_count = 0
+        self.char_count = 0
+        self.correct_word_count = 0
+        self.correct_char_count = 0
+        self.error_char_count = 0
+
+    def add_words(self, word: str, is_correct: bool, correct_characters: int, timestamp: float | None = None):
+        self.store.add_word(word, is_correct, correct_characters, timestamp)
+        self.update_counters(word, is_correct, correct_characters, 1)
+
+    def update_counters(self, word: str, is_correct: bool, correct_characters: int, sign: int):
+        word_length = len(word)
+        self.word_count += sign
+        self.char_count += sign * word_length
+        self.error_char_count += sign * (word_length - correct_characters)
+        if is_correct:
+            self.correct_word_count += sign
+            self.correct_char_count += sign * word_length
 
     def get_char_count(self):
-        if not self.word_stats:
-            return 0
-        char_counts = [len(stat.word) for stat in self.word_stats]
-        return sum(char_counts)
+        return self.char_count
 
     def get_word_count(self):
-        return len(self.word_stats)
+        return self.word_count
 
     def get_correct_words_count(self):
-        correct_words = self.get_correct_words()
-        return len(correct_words)
+        return self.correct_word_count
 
     def get_correct_char_count(self):
-        if not self.word_stats:
+        return self.correct_char_count
+
+    def get_error_char_count(self):
+        return self.error_char_count
+
+    def get_aligned_char_count(self):
+        return self.char_count - self.error_char_count
+
+    def get_accuracy(self):
+        if not self.char_count:
+            return 0.0
+        return self.get_aligned_char_count() * 100 / self.char_count
+
+    def get_chars_per_minute(self, elapsed):
+        if elapsed <= 0:
             return 0
-        correct_chars = [stat.correct_characters for stat in self.word_stats]
-        return sum(correct_chars)
+        return round(self.get_aligned_char_count() * 60 / elapsed)
+
+    def get_words_per_minute(self, elapsed):
+        if elapsed <= 0:
+            return 0
+        return round(self.correct_word_count * 60 / elapsed)
+
+    def get_rolling_rates(self, now: float, window: float, elapsed: float):
+        span = min(window, elapsed)
+        if span <= 0:
+            return 0, None
+        chars = correct_chars = correct_words = 0
+        for i in range(self.store.find_first_after(now - span), self.store.get_word_count()):
+            word_stat = self.store.get_word_stat(i)
+            chars += len(word_stat.word)
+            correct_chars += word_stat.correct_characters
+            correct_words += word_stat.is_correct
+        accuracy = correct_chars * 100 / chars if chars else None
+        return correct_words * 60 / span, accuracy
+
+    def get_word_stat(self, index) -> WordStat:
+        return self.store.get_word_stat(index)
 
     def remove_last(self):
-        self.word_stats.pop()
+        if not self.store.get_word_count():
+            return
+        word_stat = self.store.pop_word()
+        self.update_counters(word_stat.word, word_stat.is_correct, word_stat.correct_characters, -1)
+
+    def get_word_stats(self):
+        return [self.store.get_word_stat(i) for i in range(self.store.get_word_count())]
 
     def get_correct_words(self):
-        if not self.word_stats:
-            return []
-        correct_words = [stat for stat in self.word_stats if stat.is_correct]
+        correct_words = [stat for stat in self.get_word_stats() if stat.is_correct]
         return correct_words
 
-    def get_correct_char_count(self):
-        correct_words = self.get_correct_words()
-        if not correct_words:
-            return 0
-        char_counts = [len(word_stat.word) for word_stat in correct_words]
-        return sum(char_counts)
+    def check_counters(self):
+        word_stats = self.get_word_stats()
+        correct_words = [stat for stat in word_stats if stat.is_correct]
+        expected = (len(word_stats),
+                    sum(len(stat.word) for stat in word_stats),
+                    len(correct_words),
+                    sum(len(stat.word) for stat in correct_words),
+                    sum(len(stat.word) - stat.correct_characters for stat in word_stats))
+        actual = (self.word_count, self.char_count, self.correct_word_count,
+                  self.correct_char_count, self.error_char_count)
+        if actual != expected:
+            raise ValueError(f"Statistics counters out of sync! Expected: {expected}; received: {actual}")
 
     def clear(self):
-        self.word_stats = []
+        self.store.clear_words()
+        self.reset_counters()
@@ -0,0 +1,26 @@
+import pytest
+from alignment import get_last_aligned_index
+
+
+@pytest.mark.parametrize("word, typed, expected", [
+    ("hello", "", None),
+    ("hello", "h", 0),
+    ("hello", "hx", 1),
+    ("hello", "hl", 2),
+    ("hello", "hlo", 4),
+    ("hello", "heel", 3),
+    ("hello", "hellox", None),
+    ("hello", "helloo", 4),
+    ("café", "caf", 2),
+    ("café", "cafe", 3),
+])
+def test_last_typed_letter_aligns_to_word_letter(word, typed, expected):
+    assert get_last_aligned_index(word, typed) == expected
+
+
+def test_reused_columns_match_fresh_alignment():
+    columns = []
+    word = "keyboard"
+    typed = "kyebaord"
+    for i in range(1, len(typed) + 1):
+        assert get_last_aligned_index(word, typed[:i], columns) == get_last_aligned_index(word, typed[:i])
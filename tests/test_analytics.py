@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from analytics import NO_CHARACTER, KeystrokeCollector
+
+
+def type_text(collector: KeystrokeCollector, word, typed):
+    for i in range(1, len(typed) + 1):
+        collector.add_text(word, float(i), typed[:i])
+    return [chr(expected) if expected != NO_CHARACTER else None for expected in collector.expected]
+
+
+def test_skipped_letter_does_not_shift_expected_characters():
+    assert type_text(KeystrokeCollector(), "hello", "hllo") == ["h", "l", "l", "o"]
+
+
+def test_extra_letters_expect_no_character():
+    assert type_text(KeystrokeCollector(), "hi", "hix") == ["h", "i", None]
+
+
+def test_substitution_expects_the_replaced_letter():
+    collector = KeystrokeCollector()
+    assert type_text(collector, "café", "cafe") == ["c", "a", "f", "é"]
+    assert collector.get_log().typed[-1] == ord("e")
+
+
+def test_backspace_restarts_alignment():
+    collector = KeystrokeCollector()
+    type_text(collector, "word", "wp")
+    collector.add_text("word", 3.0, "w")
+    collector.add_text("word", 4.0, "wo")
+    assert [chr(expected) for expected in collector.expected] == ["w", "o", "o"]
@@ -0,0 +1,49 @@
+import random
+import pytest
+from corpus import CACHE_SUFFIX, clear_corpus_cache, load_corpus
+
+NON_ASCII_WORDS = ["café", "naïve", "hello", "“quoted”", "—"]
+
+
+def test_cached_reload_of_non_ascii_words(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(NON_ASCII_WORDS), encoding="utf-8")
+    clear_corpus_cache()
+    assert list(load_corpus(str(path))) == NON_ASCII_WORDS
+    assert (tmp_path / ("words.txt" + CACHE_SUFFIX)).exists()
+    clear_corpus_cache()
+    assert list(load_corpus(str(path))) == NON_ASCII_WORDS
+
+
+def test_cached_reload_of_counted_non_ascii_words(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("café\t3\nnaïve\t1\nhello\t2", encoding="utf-8")
+    clear_corpus_cache()
+    load_corpus(str(path))
+    clear_corpus_cache()
+    corpus = load_corpus(str(path))
+    assert list(corpus) == ["café", "naïve", "hello"]
+    assert list(corpus.counts) == [3.0, 1.0, 2.0]
+    assert corpus.is_weighted()
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert load_corpus(str(tmp_path / "missing.txt")) is None
+
+
+@pytest.mark.parametrize("count", ["nan", "inf", "-inf", "-5", "ten"])
+def test_invalid_counts_are_rejected(tmp_path, count):
+    path = tmp_path / "words.txt"
+    path.write_text(f"hello\t3\nworld\t{count}\n", encoding="utf-8")
+    clear_corpus_cache()
+    with pytest.raises(ValueError, match="line 2"):
+        load_corpus(str(path))
+
+
+def test_zero_counts_are_kept_but_never_drawn(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("hello\t3\nnever\t0\n", encoding="utf-8")
+    clear_corpus_cache()
+    corpus = load_corpus(str(path))
+    assert list(corpus.counts) == [3.0, 0.0]
+    assert set(corpus.alias_table.draw_many(200, random.Random(1))) == {0}
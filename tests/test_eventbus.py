@@ -0,0 +1,130 @@
+import threading
+import time
+import pytest
+from eventbus import BLOCK, COALESCE, DROP, EventBus, FieldCleared, TextUpdated, WordSubmitted
+
+CAPACITY = 4
+
+
+class GatedHandler:
+    def __init__(self, fail_on=None):
+        self.gate = threading.Event()
+        self.events = []
+        self.fail_on = fail_on
+
+    def __call__(self, event):
+        self.gate.wait()
+        if self.fail_on is not None and getattr(event, "text", None) == self.fail_on:
+            raise RuntimeError("Subscriber failed")
+        self.events.append(event)
+
+    def get_texts(self):
+        return [event.text for event in self.events]
+
+
+def create_blocked_bus(policy, handler: GatedHandler):
+    event_bus = EventBus(CAPACITY, policy, batch_size=1)
+    event_bus.subscribe(TextUpdated, handler, inline=False)
+    event_bus.subscribe(WordSubmitted, handler, inline=False)
+    event_bus.publish(TextUpdated("in flight"))
+    for _ in range(200):
+        with event_bus.condition:
+            if event_bus.in_flight and not event_bus.pending:
+                break
+        time.sleep(0.005)
+    for i in range(CAPACITY):
+        event_bus.publish(TextUpdated(f"queued {i}"))
+    return event_bus
+
+
+def release_later(handler: GatedHandler, delay=0.05):
+    timer = threading.Timer(delay, handler.gate.set)
+    timer.start()
+    return timer
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        EventBus(policy="spill")
+
+
+def test_inline_subscribers_run_synchronously_and_are_timed():
+    event_bus = EventBus()
+    texts = []
+    event_bus.subscribe(TextUpdated, lambda event: texts.append(event.text), name="render")
+    event_bus.publish(TextUpdated("a"))
+    event_bus.publish(FieldCleared())
+    assert texts == ["a"]
+    assert event_bus.worker is None
+    assert event_bus.get_timings()["TextUpdated:render"]["calls"] == 1
+
+
+def test_block_policy_delivers_everything():
+    handler = GatedHandler()
+    event_bus = create_blocked_bus(BLOCK, handler)
+    timer = release_later(handler)
+    for i in range(10):
+        event_bus.publish(TextUpdated(f"late {i}"))
+    event_bus.flush()
+    timer.join()
+    assert handler.get_texts() == (["in flight"] + [f"queued {i}" for i in range(CAPACITY)]
+                                   + [f"late {i}" for i in range(10)])
+    assert event_bus.dropped == event_bus.coalesced == 0
+    event_bus.close()
+
+
+def test_drop_policy_drops_text_but_never_submits():
+    handler = GatedHandler()
+    event_bus = create_blocked_bus(DROP, handler)
+    for i in range(3):
+        event_bus.publish(TextUpdated(f"dropped {i}"))
+    assert event_bus.dropped == 3
+    timer = release_later(handler)
+    event_bus.publish(WordSubmitted("word"))
+    event_bus.flush()
+    timer.join()
+    assert handler.get_texts() == ["in flight"] + [f"queued {i}" for i in range(CAPACITY)] + ["word"]
+    event_bus.close()
+
+
+def test_coalesce_policy_keeps_the_latest_text():
+    handler = GatedHandler()
+    event_bus = create_blocked_bus(COALESCE, handler)
+    for i in range(3):
+        event_bus.publish(TextUpdated(f"newer {i}"))
+    assert event_bus.coalesced == 3
+    assert event_bus.dropped == 0
+    timer = release_later(handler)
+    event_bus.publish(WordSubmitted("word"))
+    event_bus.flush()
+    timer.join()
+    assert handler.get_texts() == (["in flight"] + [f"queued {i}" for i in range(CAPACITY - 1)]
+                                   + ["newer 2", "word"])
+    event_bus.close()
+
+
+def test_close_drains_the_queue_and_stops_the_worker():
+    handler = GatedHandler()
+    event_bus = create_blocked_bus(BLOCK, handler)
+    timer = release_later(handler)
+    event_bus.close()
+    timer.join()
+    assert len(handler.events) == CAPACITY + 1
+    assert not event_bus.worker.is_alive()
+    event_bus.publish(TextUpdated("after close"))
+    event_bus.flush()
+    assert len(handler.events) == CAPACITY + 1
+
+
+def test_failing_subscriber_is_counted_and_worker_keeps_running():
+    handler = GatedHandler(fail_on="bad")
+    handler.gate.set()
+    event_bus = EventBus()
+    subscriber = event_bus.subscribe(TextUpdated, handler, inline=False)
+    for text in ("good", "bad", "good again"):
+        event_bus.publish(TextUpdated(text))
+    event_bus.flush()
+    assert handler.get_texts() == ["good", "good again"]
+    assert subscriber.timings.errors == 1
+    assert subscriber.timings.calls == 3
+    event_bus.close()
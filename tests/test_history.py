@@ -0,0 +1,37 @@
+from history import HistoryStore, SessionResult
+from stats import Statistics
+
+
+def create_result(started_at, words):
+    statistics = Statistics()
+    for word in words:
+        statistics.add_words(word, True, len(word))
+    return SessionResult(started_at, 60.0, statistics)
+
+
+def test_sessions_are_written_and_queried(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    for i in range(5):
+        store.add_session(create_result(i * 86400.0, ["word"] * (i + 1)))
+    store.flush()
+    recent = store.get_recent_sessions(2)
+    assert [session["word_count"] for session in recent] == [5, 4]
+    assert store.get_session_words(recent[0]["id"]) == [("word", 1, 4)] * 5
+    assert len(store.get_best_wpm_per_day()) == 5
+    store.close()
+
+
+def test_writer_survives_a_failed_batch(tmp_path, capsys):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    broken = create_result(0.0, ["word"])
+    broken.words = [(None, True, 4)]
+    store.add_session(broken)
+    store.flush()
+    assert store.failed_batches == 1
+    assert "IntegrityError" in capsys.readouterr().err
+    assert store.get_recent_sessions(10) == []
+    store.add_session(create_result(60.0, ["word", "other"]))
+    store.flush()
+    assert [session["word_count"] for session in store.get_recent_sessions(10)] == [2]
+    store.close()
+    assert not store.writer.is_alive()
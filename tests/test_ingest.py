@@ -0,0 +1,78 @@
+import tracemalloc
+import pytest
+from corpus import CACHE_SUFFIX, clear_corpus_cache, load_corpus
+from ingest import WORD_PATTERN, ingest, tokenize
+from wordgenerator import WordGenerator
+
+TEXT = "“Hello,” she said — naïve café. Don’t stop; the café is naïve, hello again.\n"
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "book.txt"
+    path.write_text(TEXT * 50, encoding="utf-8")
+    clear_corpus_cache()
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_tokenize_matches_whole_text(chunk_size):
+    chunks = [TEXT[i:i + chunk_size] for i in range(0, len(TEXT), chunk_size)]
+    assert list(tokenize(chunks)) == WORD_PATTERN.findall(TEXT)
+
+
+def test_count_mode_round_trip(source, tmp_path):
+    output = str(tmp_path / "counted.txt")
+    ingest([str(source)], output, chunk_size=5)
+    word_generator = WordGenerator(output, seed=1)
+    assert word_generator.words.is_weighted()
+    assert dict(zip(word_generator.words, word_generator.words.counts))["café"] == 100
+    assert set(word_generator.get_word_list(6)) <= set(word_generator.words)
+
+
+def test_unique_mode_round_trip(source, tmp_path):
+    output = str(tmp_path / "unique.txt")
+    ingest([str(source)], output, mode="unique", chunk_size=5)
+    words = list(WordGenerator(output).words)
+    assert words[:6] == ["hello", "she", "said", "naïve", "café", "don't"]
+    assert len(words) == len(set(words))
+
+
+def test_quote_mode_round_trip(source, tmp_path):
+    output = str(tmp_path / "quote.txt")
+    ingest([str(source)], output, mode="quote", chunk_size=5)
+    clear_corpus_cache()
+    word_generator = WordGenerator(output, quote_mode=True)
+    rows = word_generator.get_word_matrix(2, 6)
+    assert rows == [["“Hello,”", "she", "said", "—", "naïve", "café."],
+                    ["Don't", "stop;", "the", "café", "is", "naïve,"]]
+
+
+@pytest.mark.parametrize("mode", ["count", "unique", "quote"])
+def test_streamed_cache_matches_parsed_cache(source, tmp_path, mode):
+    output = str(tmp_path / f"{mode}.txt")
+    count = ingest([str(source)], output, mode=mode, chunk_size=5)
+    cache_path = tmp_path / f"{mode}.txt{CACHE_SUFFIX}"
+    streamed = cache_path.read_bytes()
+    cache_path.unlink()
+    clear_corpus_cache()
+    corpus = load_corpus(output)
+    assert len(corpus) == count
+    assert cache_path.read_bytes() == streamed
+
+
+def get_quote_ingest_peak(tmp_path, repeat):
+    path = tmp_path / f"large-{repeat}.txt"
+    path.write_text(TEXT * repeat, encoding="utf-8")
+    tracemalloc.start()
+    try:
+        ingest([str(path)], str(tmp_path / "quote.txt"), mode="quote", chunk_size=1 << 16)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_quote_mode_memory_does_not_grow_with_input(tmp_path):
+    small_peak = get_quote_ingest_peak(tmp_path, 6000)
+    large_peak = get_quote_ingest_peak(tmp_path, 24000)
+    assert large_peak < small_peak * 1.25
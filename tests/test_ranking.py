@@ -0,0 +1,66 @@
+import bisect
+import random
+import pytest
+from ranking import METRIC_LAYOUTS, RankingStore, ScoreHistogram
+
+USERS = [f"user{i}" for i in range(5)]
+
+
+def get_random_scores(random_generator: random.Random):
+    return {"cpm": max(0, round(random_generator.gauss(250, 60))),
+            "wpm": max(0, round(random_generator.gauss(45, 12))),
+            "accuracy": min(100.0, max(0.0, random_generator.gauss(93, 4)))}
+
+
+@pytest.fixture(scope="module")
+def results():
+    random_generator = random.Random(5)
+    return [(USERS[i % len(USERS)], get_random_scores(random_generator)) for i in range(20000)]
+
+
+@pytest.fixture
+def merged(tmp_path, results):
+    stores = [RankingStore() for _ in range(4)]
+    for i, (user, scores) in enumerate(results):
+        stores[i % len(stores)].add_scores(user, scores)
+    paths = []
+    for i, store in enumerate(stores):
+        path = str(tmp_path / f"ranking-{i}.json")
+        store.save(path)
+        paths.append(path)
+    return RankingStore.load_all(paths)
+
+
+@pytest.mark.parametrize("metric", sorted(METRIC_LAYOUTS))
+def test_rank_is_within_one_bucket_of_exact(merged, results, metric):
+    bucket_width = METRIC_LAYOUTS[metric][2]
+    values = sorted(scores[metric] for _, scores in results)
+    histogram = merged.everyone.histograms[metric]
+    random_generator = random.Random(1)
+    for _ in range(2000):
+        value = random_generator.uniform(values[0], values[-1])
+        if metric != "accuracy":
+            value = round(value)
+        exact = bisect.bisect_left(values, value) / len(values)
+        bucket_share = (bisect.bisect_left(values, value) - bisect.bisect_left(values, value - bucket_width)) / len(values)
+        assert abs(histogram.get_rank(value) - exact) <= bucket_share + 1e-12
+        if bucket_width == 1.0:
+            assert histogram.get_rank(value) == pytest.approx(exact)
+
+
+def test_user_ranks_match_exact(merged, results):
+    values = sorted(scores["cpm"] for user, scores in results if user == "user3")
+    ranks = merged.get_ranks("user3", {"cpm": 300, "wpm": 50, "accuracy": 95.0})
+    assert ranks["user"]["cpm"] == pytest.approx(bisect.bisect_left(values, 300) / len(values))
+    assert merged.get_ranks("nobody", {"cpm": 300})["user"] is None
+    assert merged.everyone.get_count() == len(results)
+
+
+def test_quantile_matches_exact_median(merged, results):
+    values = sorted(scores["cpm"] for _, scores in results)
+    assert merged.everyone.histograms["cpm"].get_quantile(0.5) == values[len(values) // 2]
+
+
+def test_merge_rejects_different_layouts():
+    with pytest.raises(ValueError):
+        ScoreHistogram(0, 100, 1).merge(ScoreHistogram(0, 100, 0.5))
@@ -0,0 +1,81 @@
+import random
+import struct
+import pytest
+from eventbus import EventBus, SessionStarted, TextUpdated, WordSubmitted, FieldCleared, SessionFinished
+from recorder import RecordingSubscriber, RecordingWordSource, SessionRecorder, read_events, replay, TEXT_UPDATED
+from settings import ROWS_OF_WORDS, WORDS_IN_ROW
+from stats import Statistics
+from typingsession import TypingSession
+from wordgenerator import WordGenerator
+
+
+def get_counters(statistics: Statistics):
+    return (statistics.get_word_count(), statistics.get_char_count(), statistics.get_correct_words_count(),
+            statistics.get_correct_char_count(), statistics.get_error_char_count())
+
+
+def type_session(session: TypingSession, publish, words=200, seed=0):
+    random_generator = random.Random(seed)
+    for _ in range(words):
+        word = session.get_current_word().word
+        typed = "".join("x" if random_generator.random() < 0.1 else letter for letter in word)
+        if random_generator.random() < 0.2:
+            typed = typed[:-1]
+        for i in range(1, len(typed) + 1):
+            publish(TextUpdated(typed[:i]))
+        if random_generator.random() < 0.1:
+            publish(TextUpdated(typed[:-1]))
+        publish(WordSubmitted(typed))
+        if random_generator.random() < 0.05:
+            publish(FieldCleared())
+            publish(TextUpdated(word))
+            publish(WordSubmitted(word))
+
+
+def record_session(folder, words=200, seed=0):
+    event_bus = EventBus()
+    RecordingSubscriber(str(folder)).subscribe(event_bus)
+    statistics = Statistics()
+    event_bus.publish(SessionStarted())
+    word_source = RecordingWordSource(WordGenerator(seed=seed), event_bus)
+    session = TypingSession(word_source.get_word_matrix(ROWS_OF_WORDS, WORDS_IN_ROW), statistics, word_source)
+    event_bus.subscribe(TextUpdated, lambda event: session.check_word(event.text))
+    event_bus.subscribe(WordSubmitted, lambda event: session.move_to_next_word(event.text, event.timestamp))
+    event_bus.subscribe(FieldCleared, lambda event: session.move_to_previous_word())
+    type_session(session, event_bus.publish, words, seed)
+    event_bus.publish(SessionFinished(60.0))
+    event_bus.close()
+    return statistics
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_replay_matches_recorded_statistics(tmp_path, seed):
+    statistics = record_session(tmp_path, seed=seed)
+    (path,) = tmp_path.iterdir()
+    replayed = replay(str(path))
+    assert get_counters(replayed) == get_counters(statistics)
+    replayed.check_counters()
+
+
+def test_long_idle_gap_is_clamped(tmp_path):
+    recorder = SessionRecorder(str(tmp_path / "idle.tslog"))
+    recorder.record_row(["idle"] * WORDS_IN_ROW, timestamp=recorder.last_time)
+    recorder.record_text("id", timestamp=recorder.last_time + 3 * 60 * 60)
+    recorder.record_text("idl", timestamp=recorder.last_time + 0.5)
+    recorder.close()
+    with open(recorder.path, "rb") as file:
+        events = list(read_events(file.read()))
+    assert [value for _, kind, value in events if kind == TEXT_UPDATED] == ["id", "idl"]
+    assert events[2][0] - events[1][0] == pytest.approx(0.5)
+
+
+def test_failed_write_keeps_text_state(tmp_path):
+    recorder = SessionRecorder(str(tmp_path / "failed.tslog"))
+    recorder.record_text("abc")
+    with pytest.raises(struct.error):
+        recorder.record_text("abc" + "x" * 70000)
+    assert recorder.last_text == "abc"
+    recorder.record_text("abd")
+    recorder.close()
+    with open(recorder.path, "rb") as file:
+        assert [value for _, _, value in read_events(file.read())] == ["abc", "abd"]
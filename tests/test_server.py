@@ -0,0 +1,146 @@
+import asyncio
+import json
+from server import TypingServer, MAX_ROOM_NAME_LENGTH
+from settings import ROWS_OF_WORDS, WORDS_IN_ROW
+
+
+class Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    async def send(self, **request):
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def start_server():
+    server = TypingServer(room_seed=1)
+    listener = await server.start("127.0.0.1", 0)
+    return server, listener.sockets[0].getsockname()[1]
+
+
+async def wait_for_rooms(server: TypingServer, count):
+    for _ in range(100):
+        if len(server.rooms) == count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Expected {count} rooms, got: {len(server.rooms)}")
+
+
+def test_clients_share_rows_and_keep_separate_statistics():
+    async def run():
+        server, port = await start_server()
+        clients = [await Client.connect(port) for _ in range(3)]
+        starts = [await client.send(op="start", room="race") for client in clients]
+        assert all(start["ok"] for start in starts)
+        assert starts[0]["rows"] == starts[1]["rows"] == starts[2]["rows"]
+        assert len(starts[0]["rows"]) == ROWS_OF_WORDS
+        words = [word for row in starts[0]["rows"] for word in row]
+        for i, client in enumerate(clients):
+            for word in words[:WORDS_IN_ROW + 1]:
+                typed = word if i == 0 else "x" + word[1:]
+                letters = await client.send(op="text", text=typed)
+                assert letters["ok"]
+                await client.send(op="submit", text=typed)
+        stats = [await client.send(op="stats") for client in clients]
+        assert stats[0]["correct_words"] == WORDS_IN_ROW + 1
+        assert stats[1]["correct_words"] == stats[2]["correct_words"] == 0
+        assert stats[1]["words"] == WORDS_IN_ROW + 1
+        for client in clients:
+            await client.close()
+        await wait_for_rooms(server, 0)
+        await server.close()
+
+    asyncio.run(run())
+
+
+def test_protocol_errors_are_reported():
+    async def run():
+        server, port = await start_server()
+        client = await Client.connect(port)
+        assert (await client.send(op="text", text="a"))["ok"] is False
+        assert (await client.send(op="start", room="x" * (MAX_ROOM_NAME_LENGTH + 1)))["ok"] is False
+        assert (await client.send(op="start"))["ok"] is True
+        assert (await client.send(op="unknown"))["ok"] is False
+        assert (await client.send(op="text"))["ok"] is False
+        await client.close()
+        await server.close()
+
+    asyncio.run(run())
+
+
+def test_rooms_are_evicted_when_empty():
+    async def run():
+        server, port = await start_server()
+        client = await Client.connect(port)
+        for i in range(20):
+            assert (await client.send(op="start", room=f"room-{i}"))["ok"]
+        assert list(server.rooms) == ["room-19"]
+        other = await Client.connect(port)
+        await other.send(op="start", room="room-19")
+        await client.close()
+        await asyncio.sleep(0.05)
+        assert list(server.rooms) == ["room-19"]
+        await other.close()
+        await wait_for_rooms(server, 0)
+        await server.close()
+
+    asyncio.run(run())
+
+
+def test_room_drops_rows_every_client_has_passed():
+    async def run():
+        server, port = await start_server()
+        client = await Client.connect(port)
+        start = await client.send(op="start", room="long")
+        rows = start["rows"]
+        for _ in range(30):
+            for word in rows[0]:
+                response = await client.send(op="submit", text=word)
+                rows = rows[1:] + response["new_rows"] if response["new_rows"] else rows
+            assert len(server.rooms["long"].rows) <= 2 * ROWS_OF_WORDS + 1
+        assert server.rooms["long"].first_row > 0
+        await client.close()
+        await server.close()
+
+    asyncio.run(run())
+
+
+def test_late_joiner_starts_at_the_first_kept_row():
+    async def run():
+        server, port = await start_server()
+        first = await Client.connect(port)
+        rows = (await first.send(op="start", room="lobby"))["rows"]
+        for _ in range(10):
+            for word in rows[0]:
+                response = await first.send(op="submit", text=word)
+                rows = rows[1:] + response["new_rows"] if response["new_rows"] else rows
+        room = server.rooms["lobby"]
+        assert room.first_row > 0
+        late = await Client.connect(port)
+        start = await late.send(op="start", room="lobby")
+        assert start["ok"], start
+        assert start["rows"][0] == room.rows[0]
+        assert (await late.send(op="submit", text=start["rows"][0][0]))["ok"]
+        await first.close()
+        for _ in range(30):
+            for word in start["rows"][0]:
+                response = await late.send(op="submit", text=word)
+                assert response["ok"]
+                start["rows"] = start["rows"][1:] + response["new_rows"] if response["new_rows"] else start["rows"]
+        assert len(room.rows) <= 2 * ROWS_OF_WORDS + 1
+        await late.close()
+        await wait_for_rooms(server, 0)
+        await server.close()
+
+    asyncio.run(run())
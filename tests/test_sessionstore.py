@@ -0,0 +1,71 @@
+import random
+import tracemalloc
+from sessionstore import SessionStore
+from wordgenerator import WordGenerator
+
+WORD_COUNT = 50000
+MAX_BYTES_PER_WORD = 40
+
+
+class DictWordStat:
+    def __init__(self, word: str, is_correct: bool, correct_characters: int, timestamp: float):
+        self.word = word
+        self.is_correct = is_correct
+        self.correct_characters = correct_characters
+        self.timestamp = timestamp
+
+
+def get_typed_words():
+    random_generator = random.Random(1)
+    vocabulary = list(WordGenerator(seed=1).words)
+    return [random_generator.choice(vocabulary) for _ in range(WORD_COUNT)]
+
+
+def fill_store(words):
+    store = SessionStore()
+    for i, word in enumerate(words):
+        typed = "".join(word)
+        store.add_word(word, i % 7 != 0, len(word), float(i))
+        store.push_typed(typed)
+    return store
+
+
+def fill_lists(words):
+    word_stats = []
+    typed_in_words = []
+    for i, word in enumerate(words):
+        typed = "".join(word)
+        word_stats.append(DictWordStat(word, i % 7 != 0, len(word), float(i)))
+        typed_in_words.append(typed)
+    return word_stats, typed_in_words
+
+
+def get_bytes_per_word(fill, words):
+    tracemalloc.start()
+    try:
+        result = fill(words)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert result
+    return size / len(words)
+
+
+def test_session_store_bytes_per_word():
+    words = get_typed_words()
+    before = get_bytes_per_word(fill_lists, words)
+    after = get_bytes_per_word(fill_store, words)
+    print(f"bytes per word: {before:.1f} before, {after:.1f} after")
+    assert after <= MAX_BYTES_PER_WORD
+    assert after * 4 <= before
+
+
+def test_store_round_trips_words():
+    store = fill_store(["café", "word", "café"])
+    assert store.get_word_count() == store.get_typed_count() == 3
+    assert len(store.strings) == 2
+    assert store.get_word_stat(-1).word == "café"
+    assert store.pop_typed() == "café"
+    store.clear_words()
+    store.clear_typed()
+    assert store.strings == []
@@ -0,0 +1,40 @@
+import random
+import pytest
+from sessionstore import SessionStore
+from stats import Statistics
+from wordgenerator import WordGenerator
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_counters_match_rescan_after_random_edits(seed):
+    random_generator = random.Random(seed)
+    vocabulary = list(WordGenerator(seed=seed).words)
+    statistics = Statistics()
+    for _ in range(3000):
+        if random_generator.random() < 0.3:
+            statistics.remove_last()
+        else:
+            word = random_generator.choice(vocabulary)
+            statistics.add_words(word, random_generator.random() < 0.8, random_generator.randint(0, len(word)))
+        statistics.check_counters()
+    statistics.clear()
+    statistics.check_counters()
+    assert statistics.get_word_count() == 0
+
+
+def test_shared_store_keeps_typed_words_after_clear():
+    store = SessionStore()
+    statistics = Statistics(store)
+    statistics.add_words("word", True, 4)
+    store.push_typed("word")
+    statistics.clear()
+    statistics.check_counters()
+    assert store.get_last_typed() == "word"
+
+
+def test_check_counters_detects_drift():
+    statistics = Statistics()
+    statistics.add_words("word", True, 4)
+    statistics.correct_char_count += 1
+    with pytest.raises(ValueError):
+        statistics.check_counters()
@@ -0,0 +1,65 @@
+import heapq
+import itertools
+import random
+import pytest
+from settings import TIMER_LENGTH, TIMER_TICK_LENGTH
+from timer import Timer
+
+MAX_LATENESS = 0.4
+
+
+class SlowWindow:
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.now = 0.0
+        self.callbacks = []
+        self.ids = itertools.count()
+        self.cancelled = set()
+
+    def clock(self):
+        return self.now
+
+    def after(self, delay, callback):
+        callback_id = next(self.ids)
+        fire_time = self.now + delay / 1000 + self.random.uniform(0, MAX_LATENESS)
+        heapq.heappush(self.callbacks, (fire_time, callback_id, callback))
+        return callback_id
+
+    def after_cancel(self, callback_id):
+        self.cancelled.add(callback_id)
+
+    def run(self):
+        while self.callbacks:
+            fire_time, callback_id, callback = heapq.heappop(self.callbacks)
+            if callback_id in self.cancelled:
+                continue
+            self.now = max(self.now, fire_time)
+            callback()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_timer_stops_within_one_late_callback_of_its_length(seed):
+    window = SlowWindow(seed)
+    labels = []
+    ticks = []
+    stops = []
+    timer = Timer(window, labels.append, lambda: stops.append(window.now), ticks.append, clock=window.clock)
+    timer.start_timer()
+    window.run()
+    assert len(stops) == 1
+    assert TIMER_LENGTH <= stops[0] <= TIMER_LENGTH + MAX_LATENESS + 0.001
+    assert timer.get_elapsed() == TIMER_LENGTH
+    assert labels == list(range(TIMER_LENGTH, -1, -1))
+    assert len(ticks) <= TIMER_LENGTH / TIMER_TICK_LENGTH + 1
+    assert ticks == sorted(ticks)
+
+
+def test_reset_cancels_pending_tick():
+    window = SlowWindow(0)
+    stops = []
+    timer = Timer(window, lambda count: None, lambda: stops.append(window.now), clock=window.clock)
+    timer.start_timer()
+    timer.reset_timer()
+    window.run()
+    assert stops == []
+    assert not timer.timer_running
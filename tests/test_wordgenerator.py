@@ -0,0 +1,77 @@
+import pytest
+from settings import ROWS_OF_WORDS, WORDS_IN_ROW
+from wordgenerator import SAMPLE_BLOCK_SIZE, WordGenerator, np
+
+ROW_COUNT = 2 * SAMPLE_BLOCK_SIZE // WORDS_IN_ROW
+
+
+def get_rows(word_generator: WordGenerator):
+    return word_generator.get_word_matrix(ROWS_OF_WORDS, WORDS_IN_ROW) + \
+        [word_generator.get_word_list(WORDS_IN_ROW) for _ in range(ROW_COUNT)]
+
+
+def create_generator(seed, use_numpy, words_file=None):
+    if use_numpy and np is None:
+        pytest.skip("numpy is not installed")
+    word_generator = WordGenerator(seed=seed) if words_file is None else WordGenerator(words_file, seed=seed)
+    if not use_numpy:
+        word_generator.numpy_random = None
+    return word_generator
+
+
+@pytest.fixture
+def counted_words_file(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(f"word{i}\t{i % 5 + 1}" for i in range(200)), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False], ids=["numpy", "random"])
+def test_same_seed_gives_same_words(use_numpy):
+    rows = get_rows(create_generator(7, use_numpy))
+    assert rows == get_rows(create_generator(7, use_numpy))
+    assert rows != get_rows(create_generator(8, use_numpy))
+    assert all(len(row) == WORDS_IN_ROW and None not in row for row in rows)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False], ids=["numpy", "random"])
+def test_same_seed_gives_same_weighted_words(use_numpy, counted_words_file):
+    rows = get_rows(create_generator(7, use_numpy, counted_words_file))
+    assert rows == get_rows(create_generator(7, use_numpy, counted_words_file))
+    assert rows != get_rows(create_generator(8, use_numpy, counted_words_file))
+
+
+def test_adaptive_words_are_deterministic():
+    def run(seed):
+        word_generator = WordGenerator(seed=seed, adaptive=True)
+        words = []
+        for i in range(500):
+            word = word_generator.get_word()
+            word_generator.record_result(word, i % 3 != 0)
+            words.append(word)
+        return words
+    assert run(3) == run(3)
+
+
+def test_mistyped_letter_patterns_are_oversampled(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join([f"xy{i:03}" for i in range(50)] + [f"ab{i:03}" for i in range(50)]), encoding="utf-8")
+
+    def count_pattern_draws(mistakes):
+        word_generator = WordGenerator(str(path), seed=1, adaptive=True)
+        for _ in range(mistakes):
+            word_generator.record_result("xy000", False)
+        words = [word_generator.get_word() for _ in range(2000)]
+        return sum(word.startswith("xy") and word != "xy000" for word in words)
+
+    baseline = count_pattern_draws(0)
+    assert count_pattern_draws(3) > 1.5 * baseline
+
+
+def test_correct_words_decay_letter_patterns():
+    word_generator = WordGenerator(seed=1, adaptive=True)
+    word_generator.record_result("hello", False)
+    assert word_generator.get_pattern_weight("help") > 1.0
+    for _ in range(20):
+        word_generator.record_result("hello", True)
+    assert word_generator.pattern_weights == {}
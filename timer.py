@@ -1,35 +1,71 @@
+import math
+import time
 import tkinter as tk
-from settings import TIMER_LENGTH
+from settings import TIMER_LENGTH, TIMER_TICK_LENGTH
 from typing import Callable
 
 
 class Timer:
-    def __init__(self, window: tk.Tk, label_update_func: Callable, stop_func: Callable):
+    def __init__(self, window: tk.Tk, label_update_func: Callable, stop_func: Callable,
+                 tick_func: Callable[[float], None] | None = None, tick_length=TIMER_TICK_LENGTH,
+                 clock: Callable[[], float] = time.monotonic):
         self.window = window
         self.label_update = label_update_func
+        self.tick_update = tick_func
+        self.tick_length = tick_length
+        self.clock = clock
+        self.timer_length = TIMER_LENGTH
         self.timer_count = TIMER_LENGTH
         self.timer = None
         self.timer_running = False
+        self.start_time = None
+        self.next_tick = None
+        self.elapsed = 0.0
         self.stopped = stop_func
 
     def start_timer(self, timer_length=TIMER_LENGTH):
+        self.timer_length = timer_length
         self.timer_count = timer_length
         self.timer_running = True
-        self.count_down(self.timer_count)
+        self.start_time = self.clock()
+        self.next_tick = self.start_time
+        self.elapsed = 0.0
+        self.label_update(self.timer_count)
+        self.schedule_tick()
 
-    def count_down(self, count):
-        if count >= 0:
+    def schedule_tick(self):
+        end_time = self.start_time + self.timer_length
+        now = self.clock()
+        while self.next_tick <= now:
+            self.next_tick += self.tick_length
+        deadline = min(self.next_tick, end_time)
+        delay = max(0, math.ceil((deadline - now) * 1000))
+        self.timer = self.window.after(delay, self.tick)
+
+    def tick(self):
+        self.timer = None
+        self.elapsed = min(self.clock() - self.start_time, self.timer_length)
+        count = math.ceil(self.timer_length - self.elapsed)
+        if count != self.timer_count:
             self.timer_count = count
             self.label_update(self.timer_count)
-            self.timer = self.window.after(1000, self.count_down, self.timer_count - 1)
-        else:
-            self.window.after_cancel(self.timer)
+        if self.tick_update is not None:
+            self.tick_update(self.elapsed)
+        if self.elapsed >= self.timer_length:
             self.timer_running = False
             self.stopped()
+            return
+        self.schedule_tick()
+
+    def get_elapsed(self):
+        if self.timer_running:
+            return min(self.clock() - self.start_time, self.timer_length)
+        return self.elapsed
 
     def reset_timer(self):
-        self.window.after_cancel(self.timer)
+        if self.timer is not None:
+            self.window.after_cancel(self.timer)
+            self.timer = None
         self.timer_running = False
-        self.timer_count = 60
-
-
+        self.timer_count = TIMER_LENGTH
+        self.elapsed = 0.0
@@ -0,0 +1,163 @@
+from settings import ROWS_OF_WORDS, WORDS_IN_ROW
+from stats import Statistics
+from wordgenerator import WordGenerator
+from alignment import PENDING, CORRECT, WRONG, align, get_first_column
+
+
+class WordState:
+    __slots__ = ("word", "letter_states", "last_input", "columns")
+
+    def __init__(self, word: str):
+        self.word = word
+        self.letter_states = bytearray(len(word))
+        self.last_input = ""
+        self.columns = [get_first_column(word)]
+
+    def reset(self):
+        self.letter_states[:] = bytes(len(self.word))
+        self.last_input = ""
+
+    def compare_input(self, current_input: str, final=False):
+        if self.last_input is not None:
+            del self.columns[get_common_prefix_length(self.last_input, current_input) + 1:]
+        else:
+            del self.columns[1:]
+        align(self.word, current_input, final, self.columns, self.letter_states)
+        self.last_input = current_input
+        if final:
+            del self.columns[1:]
+            self.last_input = None
+
+    def get_correct_letter_count(self):
+        return self.letter_states.count(CORRECT)
+
+
+def get_common_prefix_length(first: str, second: str):
+    length = min(len(first), len(second))
+    for i in range(length):
+        if first[i] != second[i]:
+            return i
+    return length
+
+
+class TypingSession:
+    def __init__(self, starting_words: list[list[str]], statistics: Statistics, word_generator: WordGenerator):
+        self.check_starting_words(starting_words)
+        self.statistics = statistics
+        self.word_generator = word_generator
+        self.rows = [self.create_row(words) for words in starting_words]
+        self.column_counter = 0
+        self.row_counter = 0
+
+    @classmethod
+    def from_generator(cls, word_generator: WordGenerator, statistics: Statistics | None = None):
+        starting_words = word_generator.get_word_matrix(ROWS_OF_WORDS, WORDS_IN_ROW)
+        return cls(starting_words, statistics if statistics is not None else Statistics(), word_generator)
+
+    @staticmethod
+    def check_starting_words(starting_words: list[list[str]]):
+        if len(starting_words) != ROWS_OF_WORDS:
+            raise ValueError(f"Unexpected number of rows in starting words! Expected: {ROWS_OF_WORDS}; "
+                             f"received: {len(starting_words)}")
+
+    @staticmethod
+    def create_row(words: list[str]):
+        return [WordState(word) for word in words]
+
+    def get_word(self, row_index, column_index) -> WordState:
+        self.check_row_exist(row_index)
+        row = self.rows[row_index]
+        if column_index < 0 or column_index >= len(row):
+            raise IndexError(f"Word doesn't exist at index: {column_index}")
+        return row[column_index]
+
+    def check_row_exist(self, row_index):
+        if row_index < 0 or row_index >= len(self.rows):
+            raise IndexError(f"Row doesn't exist at index: {row_index}")
+
+    def get_current_word(self):
+        return self.get_word(self.row_counter, self.column_counter)
+
+    def get_position(self):
+        return self.row_counter, self.column_counter
+
+    def check_word(self, current_input: str):
+        self.get_current_word().compare_input(current_input)
+
+    def move_to_next_word(self, current_input: str, timestamp: float | None = None):
+        self.final_check(current_input, timestamp)
+        row_changed = self.increment_counters()
+        self.get_current_word().reset()
+        return row_changed
+
+    def final_check(self, current_input: str, timestamp: float | None = None):
+        word = self.get_current_word()
+        word.compare_input(current_input, final=True)
+        self.add_statistics(word, current_input, timestamp)
+
+    def add_statistics(self, word: WordState, current_input: str, timestamp: float | None = None):
+        is_correct = word.word == current_input
+        self.word_generator.record_result(word.word, is_correct)
+        if is_correct:
+            self.statistics.add_words(word.word, True, len(word.word), timestamp)
+            return
+        self.statistics.add_words(word.word, False, word.get_correct_letter_count(), timestamp)
+
+    def increment_counters(self):
+        if self.is_last_in_row():
+            self.row_counter += 1
+            self.column_counter = 0
+            self.check_to_add_new_row()
+            return True
+        self.column_counter += 1
+        return False
+
+    def is_last_in_row(self):
+        return self.column_counter == WORDS_IN_ROW - 1
+
+    def move_to_previous_word(self):
+        self.statistics.remove_last()
+        row_changed = self.decrement_counters()
+        self.get_current_word().reset()
+        return row_changed
+
+    def decrement_counters(self):
+        if self.column_counter == 0 and self.row_counter != 0:
+            self.row_counter -= 1
+            self.column_counter = WORDS_IN_ROW - 1
+            return True
+        if self.column_counter != 0:
+            self.column_counter -= 1
+        return False
+
+    def check_to_add_new_row(self):
+        if self.is_last_row():
+            self.create_new_row()
+
+    def create_new_row(self):
+        words = self.word_generator.get_word_list(WORDS_IN_ROW)
+        self.rows.append(self.create_row(words))
+
+    def prepare_row(self, row_index):
+        while len(self.rows) <= row_index:
+            self.create_new_row()
+
+    def is_last_row(self):
+        return self.row_counter == len(self.rows) - 1
+
+    def get_current_row_range(self):
+        return self.get_row_range(self.row_counter)
+
+    def get_next_row_range(self):
+        return self.get_row_range(self.row_counter + 1)
+
+    @staticmethod
+    def get_row_range(row_counter):
+        if row_counter < (ROWS_OF_WORDS - 1):
+            return 0, ROWS_OF_WORDS
+        return row_counter - 1, row_counter + 2
+
+    def type_word(self, typed_word: str, timestamp: float | None = None):
+        for i in range(1, len(typed_word) + 1):
+            self.check_word(typed_word[:i])
+        return self.move_to_next_word(typed_word, timestamp)
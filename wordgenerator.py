@@ -1,40 +1,162 @@
 import random
+from collections import deque
+from corpus import Corpus, load_corpus
+from fenwick import FenwickTree
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 WORDS_fILE = "assets/words.txt"
+SAMPLE_BLOCK_SIZE = 4096
+PREFETCH_ROWS = 16
+ERROR_BOOST = 4.0
+MAX_BOOST = 64.0
+CORRECT_DECAY = 0.5
+PATTERN_CANDIDATES = 4
+MIN_PATTERN_BOOST = 0.01
+
+
+def get_letter_patterns(word: str):
+    return {word[i:i + 2] for i in range(len(word) - 1)}
 
 
 class WordGenerator:
-    def __init__(self):
-        self.words_file = WORDS_fILE
+    def __init__(self, words_file=WORDS_fILE, seed=None, adaptive=False, quote_mode=False):
+        if adaptive and quote_mode:
+            raise ValueError("Adaptive words can't be used in quote mode")
+        self.words_file = words_file
         self.words = self._get_words_list()
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.numpy_random = np.random.default_rng(seed) if np is not None else None
+        self.index_buffer = []
+        self.index_position = 0
+        self.row_buffer = deque()
+        self.adaptive_weights = self._get_adaptive_weights() if adaptive else None
+        self.drawn_indices: dict[str, int] = {}
+        self.pattern_weights: dict[str, float] = {}
+        self.quote_mode = quote_mode
+        self.quote_position = 0
 
-    def _open_file(self):
-        try:
-            with open(self.words_file) as file:
-                return file.read()
-        except FileNotFoundError:
+    def _get_adaptive_weights(self):
+        if not self.words:
             return None
+        if self.words.is_weighted():
+            return FenwickTree(self.words.counts)
+        return FenwickTree([1.0] * len(self.words))
+
+    def is_adaptive(self):
+        return self.adaptive_weights is not None
+
+    def get_base_weight(self, index):
+        if self.words.is_weighted():
+            return self.words.counts[index]
+        return 1.0
+
+    def record_result(self, word: str, is_correct: bool):
+        if not self.is_adaptive():
+            return
+        self.record_patterns(word, is_correct)
+        index = self.drawn_indices.get(word)
+        if index is None:
+            return
+        base_weight = self.get_base_weight(index)
+        weight = self.adaptive_weights.get(index)
+        if is_correct:
+            weight = base_weight + (weight - base_weight) * CORRECT_DECAY
+        else:
+            weight = min(weight * ERROR_BOOST, base_weight * MAX_BOOST)
+        self.adaptive_weights.set(index, weight)
+
+    def record_patterns(self, word: str, is_correct: bool):
+        for pattern in get_letter_patterns(word):
+            weight = self.pattern_weights.get(pattern, 1.0)
+            if is_correct:
+                weight = 1.0 + (weight - 1.0) * CORRECT_DECAY
+            else:
+                weight = min(weight * ERROR_BOOST, MAX_BOOST)
+            if weight - 1.0 < MIN_PATTERN_BOOST:
+                self.pattern_weights.pop(pattern, None)
+            else:
+                self.pattern_weights[pattern] = weight
+
+    def get_pattern_weight(self, word: str):
+        return max((self.pattern_weights.get(pattern, 1.0) for pattern in get_letter_patterns(word)), default=1.0)
 
     def _get_words_list(self):
-        raw_text = self._open_file()
-        if raw_text is None:
-            return []
-        return raw_text.split("\n")
+        corpus = load_corpus(self.words_file)
+        if corpus is None:
+            return Corpus.from_words([])
+        return corpus
+
+    def _draw_indices(self, count):
+        if self.quote_mode:
+            return self._take_quote_indices(count)
+        if self.is_adaptive():
+            return [self._draw_adaptive_index() for _ in range(count)]
+        if self.words.is_weighted():
+            return self.words.alias_table.draw_many(count, self.random, self.numpy_random)
+        if self.numpy_random is not None:
+            return self.numpy_random.integers(0, len(self.words), count).tolist()
+        return self.random.choices(range(len(self.words)), k=count)
+
+    def _draw_adaptive_index(self):
+        weights = self.adaptive_weights
+        total = weights.get_total()
+        if not self.pattern_weights:
+            return weights.find(self.random.random() * total)
+        candidates = [weights.find(self.random.random() * total) for _ in range(PATTERN_CANDIDATES)]
+        pattern_weights = [self.get_pattern_weight(self.words[index]) for index in candidates]
+        return self.random.choices(candidates, pattern_weights)[0]
+
+    def _take_quote_indices(self, count):
+        word_count = len(self.words)
+        indices = [(self.quote_position + i) % word_count for i in range(count)]
+        self.quote_position = (self.quote_position + count) % word_count
+        return indices
+
+    def _take_indices(self, count):
+        available = len(self.index_buffer) - self.index_position
+        if available < count:
+            remaining = self.index_buffer[self.index_position:]
+            block_size = count - available if self.is_adaptive() else max(SAMPLE_BLOCK_SIZE, count - available)
+            self.index_buffer = remaining + self._draw_indices(block_size)
+            self.index_position = 0
+        indices = self.index_buffer[self.index_position:self.index_position + count]
+        self.index_position += count
+        return indices
+
+    def prefetch(self, columns, rows=PREFETCH_ROWS):
+        if not self.words:
+            return
+        while len(self.row_buffer) < rows:
+            self.row_buffer.append(self._get_words(self._take_indices(columns)))
+
+    def _get_words(self, indices):
+        text = self.words.text
+        offsets = self.words.text_offsets
+        words = [text[offsets[index]:offsets[index + 1]] for index in indices]
+        if self.is_adaptive():
+            self.drawn_indices.update(zip(words, indices))
+        return words
 
     def get_word(self):
         if not self.words:
             return None
-        return random.choice(self.words)
+        return self._get_words(self._take_indices(1))[0]
 
     def get_word_list(self, number_of_words):
-        words = []
-        for i in range(number_of_words):
-            words.append(self.get_word())
-        return words
+        if not self.words:
+            return [None] * number_of_words
+        if not self.row_buffer or len(self.row_buffer[0]) != number_of_words:
+            self.row_buffer.clear()
+            self.prefetch(number_of_words, rows=1 if self.is_adaptive() else PREFETCH_ROWS)
+        return self.row_buffer.popleft()
 
     def get_word_matrix(self, rows, columns):
         matrix = []
         for i in range(rows):
             matrix.append(self.get_word_list(columns))
         return matrix
-